@@ -1,126 +1,345 @@
 import os
 import re
+import sys
+import time
+import hashlib
+import queue
+import threading
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
 import urllib.parse
-from utils.logging_utils import log_message
-from config.config import get_api_key, is_imdb_folder_id_enabled, is_tvdb_folder_id_enabled, is_tmdb_folder_id_enabled
-from utils.file_utils import clean_query, normalize_query, standardize_title, remove_genre_names, extract_title, clean_query_movie
-
-_api_cache = {}
+from utils.logging_utils import log_message, log_enabled, flush_logs
+from utils.http_utils import http_session, REQUEST_TIMEOUT
+from config.config import FILE_WORKERS, get_api_key, is_imdb_folder_id_enabled, is_tvdb_folder_id_enabled, is_tmdb_folder_id_enabled
+from utils.file_utils import clean_query, normalize_query, standardize_title, remove_genre_names, extract_title, clean_query_movie, year_of
+from processors.db_utils import initialize_tmdb_cache, get_cached_lookup, save_cached_lookup, get_cached_response, save_cached_response
+
+# Bounded LRU of resolved lookups keyed by (media_type, query, year)
+API_CACHE_SIZE = 4096
+_api_cache = OrderedDict()
+_api_cache_lock = threading.Lock()
+
+# Lookups currently being resolved, so concurrent callers for the same key wait instead
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+_PAREN_TAIL_RE = re.compile(r'\s*\(.*$')
+_TV_ID_RE = re.compile(r'/tv/(\d+)')
+_EMBEDDED_ID_RE = re.compile(r'\{(imdb|tmdb|tvdb)-([^}]+)\}')
+# First <a> tag with a "result" class token on a themoviedb.org search page, and its href.
+# Only one link is needed, so the raw page is scanned instead of building a DOM.
+_RESULT_LINK_RE = re.compile(rb'<a\s[^>]*?\bclass="(?:[^"]*\s)?result(?:\s[^"]*)?"[^>]*>')
+_HREF_RE = re.compile(rb'\bhref="([^"]*)"')
+
+# Runs the look-ahead fallback search for a title that missed the primary search.
+# Each file worker has at most one task here, so the pool matches the worker count.
+_fallback_executor = ThreadPoolExecutor(max_workers=FILE_WORKERS, thread_name_prefix='tmdb-fallback')
+
+# Interactive choices are asked one at a time by a single prompt thread
+_prompt_queue = queue.Queue()
+
+# Resolved lookups are also persisted to disk so rescans skip TMDb entirely
+initialize_tmdb_cache()
 
 # Global variables for API key status and warnings
 api_key = get_api_key()
-api_warning_logged = False
 
 def check_api_key():
-    global api_key, api_warning_logged
+    """Whether a validated API key is available, picking it up once config has validated it."""
+    global api_key
     if not api_key:
-        return False
-    url = "https://api.themoviedb.org/3/configuration"
-    params = {'api_key': api_key}
+        api_key = get_api_key()
+    return bool(api_key)
+
+def _cache_get(key):
+    with _api_cache_lock:
+        if key not in _api_cache:
+            return None
+        _api_cache.move_to_end(key)
+        return _api_cache[key]
+
+def _cache_set(key, value):
+    with _api_cache_lock:
+        _api_cache[key] = value
+        _api_cache.move_to_end(key)
+        if len(_api_cache) > API_CACHE_SIZE:
+            _api_cache.popitem(last=False)
+    return value
+
+def _single_flight(cache_key, resolve, *args):
+    """
+    Run resolve(*args) for cache_key unless another thread is already resolving
+    it, in which case wait for that thread and return its cached result.
+    """
+    while True:
+        with _inflight_lock:
+            event = _inflight.get(cache_key)
+            if event is None:
+                event = _inflight[cache_key] = threading.Event()
+                break
+        event.wait()
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+    try:
+        # The previous owner may have finished between our cache miss and the claim
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+        return resolve(*args)
+    finally:
+        with _inflight_lock:
+            del _inflight[cache_key]
+        event.set()
+
+def decode_json(response):
+    """Decode a TMDb response body with orjson, straight from the raw bytes."""
     try:
-        response = requests.get(url, params=params)
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        # Keep callers' RequestException handlers working for bad payloads
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+def tmdb_get(url, params, persist=True):
+    """
+    GET a TMDb JSON endpoint through the persistent response cache. Keys are
+    the URL plus sorted params without the API key. Empty search results are
+    not persisted so new releases are picked up on the next run. HTTP errors
+    raise as requests exceptions, like a plain session call.
+    With persist=False the response cache is neither read nor written.
+    """
+    if not persist:
+        response = http_session.get(url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        return True
-    except requests.exceptions.RequestException as e:
-        if not api_warning_logged:
-            log_message(f"API key validation failed: {e}", level="ERROR")
-            api_warning_logged = True
-        return False
+        return decode_json(response)
+
+    key_params = sorted((k, str(v)) for k, v in params.items() if k != 'api_key')
+    key = hashlib.sha1(f"{url}?{urllib.parse.urlencode(key_params)}".encode()).hexdigest()
+    body = get_cached_response(key)
+    if body is not None:
+        return orjson.loads(body)
+
+    response = http_session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    data = decode_json(response)
+    if data and data.get('results') != []:
+        save_cached_response(key, response.content)
+    return data
+
+def _intern(value):
+    # Names and IDs repeat for every file of a show, share one copy in the cache
+    return sys.intern(value) if isinstance(value, str) else value
+
+def refresh_folder_id_modes():
+    """
+    Snapshot the *_FOLDER_ID settings so lookups don't re-read the environment.
+    Call again if those settings change while running.
+    """
+    global _TV_FOLDER_ID_MODE, _MOVIE_FOLDER_ID_MODE
+    imdb_enabled = is_imdb_folder_id_enabled()
+    tvdb_enabled = is_tvdb_folder_id_enabled()
+    tmdb_enabled = is_tmdb_folder_id_enabled()
+
+    if imdb_enabled:
+        _TV_FOLDER_ID_MODE = 'imdb'
+    elif tvdb_enabled:
+        _TV_FOLDER_ID_MODE = 'tvdb'
+    else:
+        _TV_FOLDER_ID_MODE = 'tmdb'
+
+    if imdb_enabled:
+        _MOVIE_FOLDER_ID_MODE = 'imdb'
+    elif tmdb_enabled:
+        _MOVIE_FOLDER_ID_MODE = 'tmdb'
+    else:
+        _MOVIE_FOLDER_ID_MODE = ''
+
+refresh_folder_id_modes()
+
+def first_fallback_result(candidates):
+    """
+    Try fallback searches in priority order and return the results of the first
+    candidate that found anything. candidates is a list of (function, *args) tuples.
+    Candidates run in pairs: one in the calling thread while the next runs on the
+    fallback pool, so later candidates are never started once one has a hit.
+    """
+    for index in range(0, len(candidates), 2):
+        func, *args = candidates[index]
+        ahead = None
+        if index + 1 < len(candidates):
+            next_func, *next_args = candidates[index + 1]
+            ahead = _fallback_executor.submit(next_func, *next_args)
+        results = func(*args)
+        if results:
+            if ahead is not None:
+                ahead.cancel()
+            return results
+        if ahead is not None:
+            results = ahead.result()
+            if results:
+                return results
+    return []
+
+def first_result_href(page):
+    if not page:
+        return None
+    link = _RESULT_LINK_RE.search(page)
+    href = _HREF_RE.search(link.group(0)) if link else None
+    return href.group(1).decode() if href else None
 
 def get_external_ids(item_id, media_type):
-    url = f"https://api.themoviedb.org/3/{media_type}/{item_id}/external_ids"
-    params = {'api_key': api_key}
+    # Details and external IDs come back from one request via append_to_response
+    url = f"https://api.themoviedb.org/3/{media_type}/{item_id}"
+    params = {'api_key': api_key, 'append_to_response': 'external_ids'}
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return tmdb_get(url, params).get('external_ids') or {}
     except requests.exceptions.RequestException as e:
         log_message(f"Error fetching external IDs: {e}", level="ERROR")
         return {}
 
-@lru_cache(maxsize=None)
-def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=None):
-    global api_key
-    if not check_api_key():
-        return query
-
-    cache_key = (query, year)
-    if cache_key in _api_cache:
-        return _api_cache[cache_key]
+# Show folder names per folder ID mode, filled from a dict of name/year/ids
+_SHOW_NAME_TEMPLATES = {
+    'imdb': "{name} ({year}) {{imdb-{imdb}}}",
+    'tvdb': "{name} ({year}) {{tvdb-{tvdb}}}",
+    'tmdb': "{name} ({year}) {{tmdb-{tmdb}}}",
+}
 
-    url = "https://api.themoviedb.org/3/search/tv"
+TV_SEARCH_URL = "https://api.themoviedb.org/3/search/tv"
+MOVIE_SEARCH_URL = "https://api.themoviedb.org/3/search/movie"
 
-    def fetch_results(query, year=None):
-        params = {'api_key': api_key, 'query': query}
-        full_url = f"{url}?{urllib.parse.urlencode(params)}"
+def _fetch_tv_results(query, year=None):
+    params = {'api_key': api_key, 'query': query}
+    if log_enabled("DEBUG"):
+        full_url = f"{TV_SEARCH_URL}?{urllib.parse.urlencode(params)}"
         log_message(f"Primary search URL (without year): {full_url}", "DEBUG", "stdout")
-        response = perform_search(params, url)
+    response = perform_search(params, TV_SEARCH_URL)
 
-        if not response and year:
-            params['first_air_date_year'] = year
-            full_url_with_year = f"{url}?{urllib.parse.urlencode(params)}"
+    if not response and year:
+        params['first_air_date_year'] = year
+        if log_enabled("DEBUG"):
+            full_url_with_year = f"{TV_SEARCH_URL}?{urllib.parse.urlencode(params)}"
             log_message(f"Secondary search URL (with year): {full_url_with_year}", "DEBUG", "stdout")
-            response = perform_search(params, url)
+        response = perform_search(params, TV_SEARCH_URL)
 
-        return response
+    return response
 
-    def search_with_extracted_title(query, year=None):
-        title = extract_title(query)
-        return fetch_results(title, year)
+def _fetch_movie_results(query, year=None):
+    params = {'api_key': api_key, 'query': query}
+    if year:
+        params['primary_release_year'] = year
 
-    def search_fallback(query, year=None):
-        query = re.sub(r'\s*\(.*$', '', query).strip()
-        log_message(f"Fallback search query: '{query}'", "DEBUG", "stdout")
-        return fetch_results(query, year)
+    if log_enabled("DEBUG"):
+        full_url = f"{MOVIE_SEARCH_URL}?{urllib.parse.urlencode(params)}"
+        log_message(f"Primary search URL (without year): {full_url}", "DEBUG", "stdout")
+    response = perform_search(params, MOVIE_SEARCH_URL)
 
-    results = fetch_results(query, year)
+    if not response and year:
+        del params['primary_release_year']
+        if log_enabled("DEBUG"):
+            full_url_without_year = f"{MOVIE_SEARCH_URL}?{urllib.parse.urlencode(params)}"
+            log_message(f"Secondary search URL (without year): {full_url_without_year}", "DEBUG", "stdout")
+        response = perform_search(params, MOVIE_SEARCH_URL)
 
-    if not results:
-        results = search_with_extracted_title(query, year)
-        log_message(f"Primary search failed, attempting with extracted title", "DEBUG", "stdout")
+    return response
 
-    if not results:
-        results = perform_fallback_tv_search(query, year)
+def _search_with_extracted_title(fetch_results, query, year=None):
+    title = extract_title(query)
+    return fetch_results(title, year)
 
-    if not results and year:
-        results = search_fallback(query, year)
+def _search_without_parenthetical(fetch_results, query, year=None):
+    query = _PAREN_TAIL_RE.sub('', query).strip()
+    log_message(f"Fallback search query: '{query}'", "DEBUG", "stdout")
+    return fetch_results(query, year)
 
-    if not results:
-        log_message(f"Searching with Cleaned Show Name", "DEBUG", "stdout")
-        title = clean_query(file)
-        results = fetch_results(title, year)
+def _search_year_only(url, year):
+    log_message(f"Fallback search by year only: {year}", "DEBUG", "stdout")
+    return perform_search({'api_key': api_key, 'query': year}, url)
 
-    if not results and year:
-        fallback_url = f"https://api.themoviedb.org/3/search/tv?api_key={api_key}&query={year}"
-        log_message(f"Fallback search URL: {fallback_url}", "DEBUG", "stdout")
-        try:
-            response = requests.get(fallback_url)
-            response.raise_for_status()
-            results = response.json().get('results', [])
-        except requests.exceptions.RequestException as e:
-            log_message(f"Error during fallback search: {e}", level="ERROR")
+def search_by_embedded_id(query, media_type):
+    """
+    Look a title up directly when the query already carries an {imdb-...},
+    {tmdb-...} or {tvdb-...} tag, skipping the search and fallback chain.
+    Returns results shaped like a search response, or [] if there is no tag.
+    """
+    match = _EMBEDDED_ID_RE.search(query)
+    if not match:
+        return []
+
+    source, item_id = match.groups()
+    log_message(f"Query '{query}' contains {source} ID {item_id}, looking it up directly", "DEBUG", "stdout")
+    try:
+        if source == 'tmdb':
+            url = f"https://api.themoviedb.org/3/{media_type}/{item_id}"
+            details = tmdb_get(url, {'api_key': api_key})
+            return [details] if details else []
+
+        url = f"https://api.themoviedb.org/3/find/{item_id}"
+        params = {'api_key': api_key, 'external_source': f"{source}_id"}
+        return tmdb_get(url, params).get(f"{media_type}_results", [])
+    except requests.exceptions.RequestException as e:
+        log_message(f"Error looking up {source} ID {item_id}: {e}", level="ERROR")
+        return []
+
+def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=None):
+    """
+    Resolve a show to its folder name. Always returns a string: the proper
+    name with any folder ID on success, or the query itself when nothing matched.
+    """
+    global api_key
+    if not check_api_key():
+        return query
+
+    query = _intern(query)
+    cache_key = ('tv', query, year)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    return _single_flight(cache_key, _resolve_tv_show, cache_key, query, year, auto_select, actual_dir, file)
+
+def _resolve_tv_show(cache_key, query, year, auto_select, actual_dir, file):
+    # Cached show names embed the folder ID, so they are only valid for the same mode
+    id_mode = _TV_FOLDER_ID_MODE
+    persisted = get_cached_lookup('tv', query, year, id_mode)
+    if persisted is not None:
+        return _cache_set(cache_key, _intern(persisted))
+
+    results = search_by_embedded_id(query, 'tv') or _fetch_tv_results(query, year)
 
     if not results:
-        log_message(f"Attempting with Search with Cleaned Name", "DEBUG", "stdout")
+        log_message(f"Primary search failed, running fallback searches concurrently", "DEBUG", "stdout")
+
+        # Ordered by priority, the first candidate with results wins
+        candidates = [
+            (_search_with_extracted_title, _fetch_tv_results, query, year),
+            (perform_fallback_tv_search, query, year),
+        ]
+        if year:
+            candidates.append((_search_without_parenthetical, _fetch_tv_results, query, year))
+        if file:
+            title, _ = clean_query(file)
+            candidates.append((_fetch_tv_results, title, year))
+        if year:
+            candidates.append((_search_year_only, TV_SEARCH_URL, year))
         cleaned_title, year_from_query = clean_query(query)
         if cleaned_title != query:
             log_message(f"Cleaned query: {cleaned_title}", "DEBUG", "stdout")
-            results = fetch_results(cleaned_title, year or year_from_query)
+            candidates.append((_fetch_tv_results, cleaned_title, year or year_from_query))
+        if actual_dir:
+            dir_based_query = os.path.basename(actual_dir)
+            log_message(f"Directory name query: '{dir_based_query}'", "DEBUG", "stdout")
+            cleaned_dir_query, dir_year = clean_query(dir_based_query)
+            candidates.append((_fetch_tv_results, cleaned_dir_query, year or dir_year))
 
-    if not results and actual_dir:
-        dir_based_query = os.path.basename(actual_dir)
-        log_message(f"Attempting search with directory name: '{dir_based_query}'", "DEBUG", "stdout")
-        cleaned_dir_query, dir_year = clean_query(dir_based_query)
-        results = fetch_results(cleaned_dir_query, year or dir_year)
+        results = first_fallback_result(candidates)
 
     if not results:
         log_message(f"No results found for query '{query}' with year '{year}'.", level="WARNING")
-        _api_cache[cache_key] = f"{query}"
-        return f"{query}"
+        return _cache_set(cache_key, query)
 
     if auto_select:
         chosen_show = results[0]
@@ -128,72 +347,54 @@ def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=No
         if len(results) == 1:
             chosen_show = results[0]
         else:
-            log_message(f"Multiple shows found for query '{query}':", level="INFO")
-            for idx, show in enumerate(results[:3]):
-                show_name = show.get('name')
-                show_id = show.get('id')
-                first_air_date = show.get('first_air_date')
-                show_year = first_air_date.split('-')[0] if first_air_date else "Unknown Year"
-                log_message(f"{idx + 1}: {show_name} ({show_year}) [tmdb-{show_id}]", level="INFO")
-
-            choice = input("Choose a show (1-3) or press Enter to skip: ").strip()
-            if choice.isdigit() and 1 <= int(choice) <= 3:
-                chosen_show = results[int(choice) - 1]
-            else:
-                chosen_show = None
+            chosen_show = request_choice(present_show_choices, results, query)
 
     if chosen_show:
-        show_name = chosen_show.get('name')
+        show_name = _intern(chosen_show.get('name'))
         first_air_date = chosen_show.get('first_air_date')
-        show_year = first_air_date.split('-')[0] if first_air_date else "Unknown Year"
+        show_year = year_of(first_air_date)
         tmdb_id = chosen_show.get('id')
-
-        external_ids = get_external_ids(tmdb_id, 'tv')
-
-        if is_imdb_folder_id_enabled():
-            imdb_id = external_ids.get('imdb_id', '')
-            log_message(f"TV Show: {show_name}, IMDB ID: {imdb_id}", level="INFO")
-            proper_name = f"{show_name} ({show_year}) {{imdb-{imdb_id}}}"
-        elif is_tvdb_folder_id_enabled():
-            tvdb_id = external_ids.get('tvdb_id', '')
-            log_message(f"TV Show: {show_name}, TVDB ID: {tvdb_id}", level="INFO")
-            proper_name = f"{show_name} ({show_year}) {{tvdb-{tvdb_id}}}"
-        else:
-            proper_name = f"{show_name} ({show_year}) {{tmdb-{tmdb_id}}}"
-
-        _api_cache[cache_key] = proper_name
-        return proper_name
+        ids = {'name': show_name, 'year': show_year, 'tmdb': tmdb_id}
+
+        # External IDs are only needed when the folder name embeds one
+        if id_mode != 'tmdb':
+            external_ids = get_external_ids(tmdb_id, 'tv')
+            ids['imdb'] = _intern(external_ids.get('imdb_id', ''))
+            ids['tvdb'] = _intern(external_ids.get('tvdb_id', ''))
+            log_message(f"TV Show: {show_name}, {id_mode.upper()} ID: {ids[id_mode]}", level="INFO")
+
+        proper_name = _SHOW_NAME_TEMPLATES[id_mode].format_map(ids)
+        save_cached_lookup('tv', query, year, id_mode, proper_name)
+        return _cache_set(cache_key, _intern(proper_name))
     else:
         log_message(f"No valid selection made for query '{query}', skipping.", level="WARNING")
-        _api_cache[cache_key] = f"{query}"
-        return f"{query}"
+        return _cache_set(cache_key, query)
 
 def perform_fallback_tv_search(query, year=None):
     cleaned_query = remove_genre_names(query)
-    search_url = f"https://www.themoviedb.org/search?query={urllib.parse.quote_plus(cleaned_query)}"
+    search_url = "https://www.themoviedb.org/search"
 
     try:
-        response = requests.get(search_url)
+        # requests encodes params itself, pass the raw query
+        response = http_session.get(search_url, params={'query': cleaned_query}, timeout=REQUEST_TIMEOUT)
+        if log_enabled("DEBUG"):
+            log_message(f"Web fallback search URL: {response.request.url}", "DEBUG", "stdout")
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        tv_show_link = soup.find('a', class_='result')
+        tv_show_link = first_result_href(response.content)
 
         if tv_show_link:
-            tv_show_id = re.search(r'/tv/(\d+)', tv_show_link['href'])
+            tv_show_id = _TV_ID_RE.search(tv_show_link)
             if tv_show_id:
                 tmdb_id = tv_show_id.group(1)
 
                 # Fetch TV show details using the TV show ID
                 details_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
                 params = {'api_key': api_key}
-                details_response = requests.get(details_url, params=params)
-                details_response.raise_for_status()
-                tv_show_details = details_response.json()
+                tv_show_details = tmdb_get(details_url, params)
 
                 if tv_show_details:
                     show_name = tv_show_details.get('name')
                     first_air_date = tv_show_details.get('first_air_date')
-                    show_year = first_air_date.split('-')[0] if first_air_date else "Unknown Year"
                     return [{'id': tmdb_id, 'name': show_name, 'first_air_date': first_air_date}]
     except requests.RequestException as e:
         log_message(f"Error during web-based fallback search: {e}", level="ERROR")
@@ -202,98 +403,64 @@ def perform_fallback_tv_search(query, year=None):
 
 def perform_search(params, url):
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        results = response.json().get('results', [])
+        results = tmdb_get(url, params).get('results', [])
         return results
     except requests.exceptions.RequestException as e:
         log_message(f"Error fetching data: {e}", level="ERROR")
         return []
 
-@lru_cache(maxsize=None)
 def search_movie(query, year=None, auto_select=False, actual_dir=None, file=None):
+    """
+    Resolve a movie. Returns a (tmdb_id, imdb_id, title) tuple on success and
+    the query string when nothing matched, so callers can tell the two apart.
+    """
     global api_key
     if not check_api_key():
         return query
 
-    cache_key = (query, year)
-    if cache_key in _api_cache:
-        return _api_cache[cache_key]
-
-    url = "https://api.themoviedb.org/3/search/movie"
-
-    def fetch_results(query, year=None):
-        params = {'api_key': api_key, 'query': query}
-        if year:
-            params['primary_release_year'] = year
-
-        full_url = f"{url}?{urllib.parse.urlencode(params)}"
-        log_message(f"Primary search URL (without year): {full_url}", "DEBUG", "stdout")
-        response = perform_search(params, url)
-
-        if not response and year:
-            del params['primary_release_year']
-            full_url_without_year = f"{url}?{urllib.parse.urlencode(params)}"
-            log_message(f"Secondary search URL (without year): {full_url_without_year}", "DEBUG", "stdout")
-            response = perform_search(params, url)
+    query = _intern(query)
+    cache_key = ('movie', query, year)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
 
-        return response
+    return _single_flight(cache_key, _resolve_movie, cache_key, query, year, auto_select, actual_dir, file)
 
-    def search_with_extracted_title(query, year=None):
-        title = extract_title(query)
-        return fetch_results(title, year)
+def _resolve_movie(cache_key, query, year, auto_select, actual_dir, file):
+    id_mode = _MOVIE_FOLDER_ID_MODE
+    persisted = get_cached_lookup('movie', query, year, id_mode)
+    if persisted is not None:
+        tmdb_id, imdb_id, movie_name = persisted
+        return _cache_set(cache_key, (tmdb_id, _intern(imdb_id), _intern(movie_name)))
 
-    def search_fallback(query, year=None):
-        query = re.sub(r'\s*\(.*$', '', query).strip()
-        log_message(f"Fallback search query: '{query}'", "DEBUG", "stdout")
-        return fetch_results(query, year)
-
-    results = fetch_results(query, year)
-
-    if not results:
-        log_message(f"Primary search failed, attempting with extracted title", "DEBUG", "stdout")
-        results = search_with_extracted_title(query, year)
-
-    if not results and file:
-        log_message(f"Searching with Cleaned Movie Name", "DEBUG", "stdout")
-        cleaned_title = clean_query_movie(file)
-        results = fetch_results(cleaned_title, year)
-        return file, cleaned_title
+    results = search_by_embedded_id(query, 'movie') or _fetch_movie_results(query, year)
 
     if not results:
-        log_message(f"Extracted title search failed, attempting web scraping fallback", "DEBUG", "stdout")
-        results = perform_fallback_movie_search(query, year)
-
-    if not results and year:
-        results = search_fallback(query, year)
-
-    if not results and year:
-        fallback_url = f"https://api.themoviedb.org/3/search/movie?api_key={api_key}&query={year}"
-        log_message(f"Fallback search URL: {fallback_url}", "DEBUG", "stdout")
-        try:
-            response = requests.get(fallback_url)
-            response.raise_for_status()
-            results = response.json().get('results', [])
-        except requests.exceptions.RequestException as e:
-            log_message(f"Error during fallback search: {e}", level="ERROR")
+        log_message(f"Primary search failed, running fallback searches concurrently", "DEBUG", "stdout")
 
-    if not results:
-        log_message(f"Attempting Search with Cleaned Name", "DEBUG", "stdout")
+        # Ordered by priority, the first candidate with results wins
+        candidates = [(_search_with_extracted_title, _fetch_movie_results, query, year)]
+        if file:
+            candidates.append((_fetch_movie_results, clean_query_movie(file), year))
+        candidates.append((perform_fallback_search, query, year))
+        if year:
+            candidates.append((_search_without_parenthetical, _fetch_movie_results, query, year))
+            candidates.append((_search_year_only, MOVIE_SEARCH_URL, year))
         cleaned_title, year_from_query = clean_query(query)
         if cleaned_title != query:
             log_message(f"Cleaned query: {cleaned_title}", "DEBUG", "stdout")
-            results = fetch_results(cleaned_title, year or year_from_query)
+            candidates.append((_fetch_movie_results, cleaned_title, year or year_from_query))
+        if actual_dir:
+            dir_based_query = os.path.basename(actual_dir)
+            log_message(f"Directory name query: '{dir_based_query}'", "DEBUG", "stdout")
+            cleaned_dir_query, dir_year = clean_query(dir_based_query)
+            candidates.append((_fetch_movie_results, cleaned_dir_query, year or dir_year))
 
-    if not results and actual_dir:
-        dir_based_query = os.path.basename(actual_dir)
-        log_message(f"Attempting search with directory name: '{dir_based_query}'", "DEBUG", "stdout")
-        cleaned_dir_query, dir_year = clean_query(dir_based_query)
-        results = fetch_results(cleaned_dir_query, year or dir_year)
+        results = first_fallback_result(candidates)
 
     if not results:
         log_message(f"No results found for query '{query}' with year '{year}'.", level="WARNING")
-        _api_cache[cache_key] = f"{query}"
-        return f"{query}"
+        return _cache_set(cache_key, query)
 
     if auto_select:
         chosen_movie = results[0]
@@ -301,41 +468,59 @@ def search_movie(query, year=None, auto_select=False, actual_dir=None, file=None
         if len(results) == 1:
             chosen_movie = results[0]
         else:
-            log_message(f"Multiple movies found for query '{query}':", level="INFO")
-            for idx, movie in enumerate(results[:3]):
-                movie_name = movie.get('title')
-                movie_id = movie.get('id')
-                release_date = movie.get('release_date')
-                movie_year = release_date.split('-')[0] if release_date else "Unknown Year"
-                log_message(f"{idx + 1}: {movie_name} ({movie_year}) [tmdb-{movie_id}]", level="INFO")
-
-            choice = input("Choose a movie (1-3) or press Enter to skip: ").strip()
-            if choice.isdigit() and 1 <= int(choice) <= 3:
-                chosen_movie = results[int(choice) - 1]
-            else:
-                chosen_movie = None
+            chosen_movie = request_choice(present_movie_choices, results, query)
 
     if chosen_movie:
-        movie_name = chosen_movie.get('title')
-        release_date = chosen_movie.get('release_date')
-        movie_year = release_date.split('-')[0] if release_date else "Unknown Year"
+        movie_name = _intern(chosen_movie.get('title'))
         tmdb_id = chosen_movie.get('id')
-        external_ids = get_external_ids(tmdb_id, 'movie')
-        imdb_id = external_ids.get('imdb_id', '')
-
-        if is_imdb_folder_id_enabled():
-            proper_name = f"{movie_name} ({movie_year}) {{imdb-{imdb_id}}}"
-        elif is_tmdb_folder_id_enabled():
-            proper_name = f"{movie_name} ({movie_year}) {{tmdb-{tmdb_id}}}"
-        else:
-            proper_name = f"{movie_name} ({movie_year})"
+        imdb_id = ''
+        if id_mode == 'imdb':
+            external_ids = get_external_ids(tmdb_id, 'movie')
+            imdb_id = _intern(external_ids.get('imdb_id', ''))
 
-        _api_cache[cache_key] = proper_name
-        return tmdb_id, imdb_id, movie_name
+        save_cached_lookup('movie', query, year, id_mode, [tmdb_id, imdb_id, movie_name])
+        return _cache_set(cache_key, (tmdb_id, imdb_id, movie_name))
     else:
         log_message(f"No valid selection made for query '{query}', skipping.", level="WARNING")
-        _api_cache[cache_key] = f"{query}"
-        return f"{query}"
+        return _cache_set(cache_key, query)
+
+def _prompt_worker():
+    while True:
+        present, results, query, future = _prompt_queue.get()
+        try:
+            future.set_result(present(results, query))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            _prompt_queue.task_done()
+
+threading.Thread(target=_prompt_worker, name='tmdb-prompt', daemon=True).start()
+
+def request_choice(present, results, query):
+    """
+    Queue an interactive choice for the prompt thread and wait for the answer.
+    Worker threads never read stdin themselves, so prompts from concurrent
+    lookups don't interleave and other lookups keep running meanwhile.
+    """
+    future = Future()
+    _prompt_queue.put((present, results, query, future))
+    return future.result()
+
+def present_show_choices(results, query):
+    log_message(f"Multiple shows found for query '{query}':", level="INFO")
+    for idx, show in enumerate(results[:3]):
+        show_name = show.get('name')
+        show_id = show.get('id')
+        first_air_date = show.get('first_air_date')
+        show_year = year_of(first_air_date)
+        log_message(f"{idx + 1}: {show_name} ({show_year}) [tmdb-{show_id}]", level="INFO")
+
+    # The header and choices are queued log lines, they must be on screen before the prompt
+    flush_logs()
+    choice = input("Choose a show (1-3) or press Enter to skip: ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= min(3, len(results)):
+        return results[int(choice) - 1]
+    return None
 
 def present_movie_choices(results, query):
     log_message(f"Multiple movies found for query '{query}':", level="INFO")
@@ -343,21 +528,22 @@ def present_movie_choices(results, query):
         movie_name = movie.get('title')
         movie_id = movie.get('id')
         release_date = movie.get('release_date')
-        movie_year = release_date.split('-')[0] if release_date else "Unknown Year"
+        movie_year = year_of(release_date)
         log_message(f"{idx + 1}: {movie_name} ({movie_year}) [tmdb-{movie_id}]", level="INFO")
 
+    flush_logs()
     choice = input("Choose a movie (1-3) or press Enter to skip: ").strip()
-    if choice.isdigit() and 1 <= int(choice) <= 3:
+    if choice.isdigit() and 1 <= int(choice) <= min(3, len(results)):
         return results[int(choice) - 1]
     return None
 
 def process_chosen_movie(chosen_movie):
     movie_name = chosen_movie.get('title')
     release_date = chosen_movie.get('release_date')
-    movie_year = release_date.split('-')[0] if release_date else "Unknown Year"
+    movie_year = year_of(release_date)
     tmdb_id = chosen_movie.get('id')
 
-    if is_imdb_folder_id_enabled():
+    if _MOVIE_FOLDER_ID_MODE == 'imdb':
         external_ids = get_external_ids(tmdb_id, 'movie')
         imdb_id = external_ids.get('imdb_id', '')
         log_message(f"Movie: {movie_name}, IMDB ID: {imdb_id}", level="INFO")
@@ -366,34 +552,41 @@ def process_chosen_movie(chosen_movie):
         return {'id': tmdb_id, 'title': movie_name, 'release_date': release_date}
 
 def perform_fallback_search(query, year=None):
+    # Relaxed JSON search on the genre-stripped title instead of scraping the website
     cleaned_query = remove_genre_names(query)
-    search_url = f"https://www.themoviedb.org/search?query={urllib.parse.quote_plus(cleaned_query)}"
+    log_message(f"Fallback search with relaxed query: '{cleaned_query}'", "DEBUG", "stdout")
+    results = perform_search({'api_key': api_key, 'query': cleaned_query}, MOVIE_SEARCH_URL)
 
-    try:
-        response = requests.get(search_url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        movie_link = soup.find('a', class_='result')
+    if results:
+        movie = results[0]
+        return [{'id': movie.get('id'), 'title': movie.get('title'), 'release_date': movie.get('release_date')}]
+    return []
 
-        if movie_link:
-            movie_id = re.search(r'/movie/(\d+)', movie_link['href'])
-            if movie_id:
-                tmdb_id = movie_id.group(1)
+# Season listings by (show_id, season_number) -> (fetched_at, {episode_number: name}).
+# Kept in memory only: seasons gain episodes as they air, so they are never persisted.
+_season_episodes = {}
+_season_episodes_lock = threading.Lock()
+# A listing younger than this is trusted even when it lacks the requested episode
+SEASON_REFRESH_SECONDS = 60
 
-                details_url = f"https://api.themoviedb.org/3/movie/{tmdb_id}"
-                params = {'api_key': api_key}
-                details_response = requests.get(details_url, params=params)
-                details_response.raise_for_status()
-                movie_details = details_response.json()
-
-                if movie_details:
-                    movie_name = movie_details.get('title')
-                    release_date = movie_details.get('release_date')
-                    return [{'id': tmdb_id, 'title': movie_name, 'release_date': release_date}]
-    except requests.RequestException as e:
-        log_message(f"Error during web-based fallback search: {e}", level="ERROR")
-
-    return []
+def get_season_episodes(show_id, season_number, max_age=None):
+    """
+    Map episode numbers to names for one season. Every episode of a season
+    shares this one request. A listing older than max_age seconds is fetched
+    again. Request errors propagate and are not cached.
+    """
+    key = (show_id, season_number)
+    with _season_episodes_lock:
+        cached = _season_episodes.get(key)
+    if cached and (max_age is None or time.monotonic() - cached[0] <= max_age):
+        return cached[1]
+
+    url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season_number}"
+    season_details = tmdb_get(url, {'api_key': get_api_key()}, persist=False)
+    episodes = {episode.get('episode_number'): episode.get('name') for episode in season_details.get('episodes', [])}
+    with _season_episodes_lock:
+        _season_episodes[key] = (time.monotonic(), episodes)
+    return episodes
 
 def get_episode_name(show_id, season_number, episode_number):
     """
@@ -406,53 +599,34 @@ def get_episode_name(show_id, season_number, episode_number):
         return None
 
     try:
-        url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season_number}/episode/{episode_number}"
-        params = {'api_key': api_key}
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        episode_data = response.json()
-        episode_name = episode_data.get('name')
-        return f"S{season_number:02d}E{episode_number:02d} - {episode_name}"
-
-    except requests.exceptions.HTTPError as e:
-        if response.status_code == 404:
-            log_message(f"Episode {episode_number} not found for season {season_number}. Falling back to season data.", level="DEBUG")
-            season_url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season_number}"
-            season_params = {'api_key': api_key}
-            try:
-                season_response = requests.get(season_url, params=season_params)
-                season_response.raise_for_status()
-                season_details = season_response.json()
-                episodes = season_details.get('episodes', [])
-                total_season_episodes = len(episodes)
-
-                if total_season_episodes == 0:
-                    log_message("No episodes found for the specified season. Ensure the season number is correct.", level="ERROR")
-                    return None
-
-                if int(episode_number) > total_season_episodes:
-                    mapped_episode_number = str((int(episode_number) % total_season_episodes) or total_season_episodes).zfill(2)
-                    log_message(
-                        f"Absolute episode {episode_number} exceeds total episodes ({total_season_episodes}) "
-                        f"for season {season_number}. Mapped to episode {mapped_episode_number}.",
-                        level="DEBUG"
-                    )
-                    mapped_url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season_number}/episode/{mapped_episode_number}"
-                    mapped_response = requests.get(mapped_url, params=params)
-                    mapped_response.raise_for_status()
-                    mapped_episode_data = mapped_response.json()
-                    mapped_episode_name = mapped_episode_data.get('name')
-                    return f"S{season_number:02d}E{mapped_episode_number} - {mapped_episode_name}"
-            except requests.exceptions.RequestException as se:
-                log_message(f"Error fetching season data: {se}", level="ERROR")
-                return None
-        else:
-            log_message(f"HTTP error occurred: {e}", level="ERROR")
-            return None
+        episodes = get_season_episodes(show_id, season_number)
+        if episode_number not in episodes:
+            # The listing may predate this episode; check a current one before any absolute mapping
+            episodes = get_season_episodes(show_id, season_number, max_age=SEASON_REFRESH_SECONDS)
     except requests.exceptions.RequestException as e:
-        log_message(f"Error fetching episode data: {e}", level="ERROR")
+        log_message(f"Error fetching season data: {e}", level="ERROR")
+        return None
+
+    if episode_number in episodes:
+        return f"S{season_number:02d}E{episode_number:02d} - {episodes[episode_number]}"
+
+    log_message(f"Episode {episode_number} not found for season {season_number}. Falling back to season data.", level="DEBUG")
+    total_season_episodes = len(episodes)
+    if total_season_episodes == 0:
+        log_message("No episodes found for the specified season. Ensure the season number is correct.", level="ERROR")
         return None
 
+    if int(episode_number) > total_season_episodes:
+        mapped_episode = (int(episode_number) % total_season_episodes) or total_season_episodes
+        mapped_episode_number = str(mapped_episode).zfill(2)
+        log_message(
+            f"Absolute episode {episode_number} exceeds total episodes ({total_season_episodes}) "
+            f"for season {season_number}. Mapped to episode {mapped_episode_number}.",
+            level="DEBUG"
+        )
+        return f"S{season_number:02d}E{mapped_episode_number} - {episodes.get(mapped_episode)}"
+    return None
+
 def get_movie_collection(movie_id=None, movie_title=None, year=None):
     api_key = get_api_key()
     if not api_key:
@@ -469,9 +643,7 @@ def get_movie_collection(movie_id=None, movie_title=None, year=None):
             'primary_release_year': year
         }
         try:
-            search_response = requests.get(search_url, params=search_params)
-            search_response.raise_for_status()
-            search_results = search_response.json().get('results', [])
+            search_results = tmdb_get(search_url, search_params).get('results', [])
 
             if search_results:
                 movie_id = search_results[0]['id']
@@ -488,9 +660,7 @@ def get_movie_collection(movie_id=None, movie_title=None, year=None):
         return None
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        movie_data = response.json()
+        movie_data = tmdb_get(url, params)
         collection = movie_data.get('belongs_to_collection')
         if collection:
             return collection['name'], collection['id']
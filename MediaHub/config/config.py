@@ -1,8 +1,11 @@
 import os
 import sys
+import time
+import threading
 import requests
 from dotenv import load_dotenv
 from utils.logging_utils import log_message
+from utils.http_utils import http_session, REQUEST_TIMEOUT
 
 api_key = None
 api_warning_logged = False
@@ -12,43 +15,71 @@ offline_mode = False
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 load_dotenv(dotenv_path)
 
+# Files processed concurrently. Workers mostly wait on TMDb and the filesystem,
+# so the CPUs are oversubscribed.
+FILE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# A key is only remembered once TMDb has accepted it. A check that could not reach
+# TMDb is retried, but no more often than this many seconds.
+API_KEY_RETRY_SECONDS = 60
+_api_key_lock = threading.Lock()
+_api_key_retry_at = 0.0
+
 def get_api_key():
-    global api_key, api_warning_logged, offline_mode
+    """Return the validated TMDB_API_KEY, or None while it is missing, rejected or unverifiable."""
+    global api_key, api_warning_logged, offline_mode, _api_key_retry_at
 
     if api_key is not None:
         return api_key
 
-    api_key = os.getenv('TMDB_API_KEY')
-
-    if not api_key or api_key == 'your_tmdb_api_key_here':
-        if not api_warning_logged:
-            log_message("TMDb API key not found or is a placeholder. TMDb functionality is not enabled. Running in offline mode.", level="WARNING")
-            offline_mode = True
-            api_warning_logged = True
-        return None
-
-    # Validate API key
-    if not is_valid_api_key(api_key):
-        if not api_warning_logged:
-            log_message("Invalid TMDb API key. TMDb functionality may not work as expected. Running in offline mode.", level="WARNING")
-            offline_mode = True
-            api_warning_logged = True
-        return None
-
-    return api_key
+    with _api_key_lock:
+        if api_key is not None:
+            return api_key
+        if time.monotonic() < _api_key_retry_at:
+            return None
+
+        key = os.getenv('TMDB_API_KEY')
+
+        if not key or key == 'your_tmdb_api_key_here':
+            if not api_warning_logged:
+                log_message("TMDb API key not found or is a placeholder. TMDb functionality is not enabled. Running in offline mode.", level="WARNING")
+                offline_mode = True
+                api_warning_logged = True
+            _api_key_retry_at = float('inf')
+            return None
+
+        # Validate API key
+        valid = is_valid_api_key(key)
+        if valid is None:
+            # TMDb could not be reached; try again later instead of giving up for good
+            log_message(f"Could not validate TMDb API key, retrying in {API_KEY_RETRY_SECONDS}s.", level="WARNING")
+            _api_key_retry_at = time.monotonic() + API_KEY_RETRY_SECONDS
+            return None
+        if not valid:
+            if not api_warning_logged:
+                log_message("Invalid TMDb API key. TMDb functionality may not work as expected. Running in offline mode.", level="WARNING")
+                offline_mode = True
+                api_warning_logged = True
+            _api_key_retry_at = float('inf')
+            return None
+
+        offline_mode = False
+        api_key = key
+        return api_key
 
 def is_valid_api_key(api_key):
+    """True if TMDb accepts the key, False if it rejects it, None if TMDb could not be reached."""
     test_url = 'https://api.themoviedb.org/3/configuration?api_key=' + api_key
     try:
-        response = requests.get(test_url)
+        response = http_session.get(test_url, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
             return True
-        else:
-            log_message(f"API key validation failed with status code: {response.status_code}", level="WARNING")
-            return False
+        log_message(f"API key validation failed with status code: {response.status_code}", level="WARNING")
+        # Only an authorization answer says the key itself is bad
+        return False if response.status_code in (401, 403) else None
     except requests.RequestException as e:
         log_message(f"API key validation error: {str(e)}", level="WARNING")
-        return False
+        return None
 
 def get_directories():
     src_dirs = os.getenv('SOURCE_DIR')
@@ -76,6 +107,9 @@ def is_movie_collection_enabled():
 def is_skip_extras_folder_enabled():
     return os.getenv('SKIP_EXTRAS_FOLDER', 'false').lower() in ['true', '1', 'yes']
 
+def is_hardlinks_enabled():
+    return os.getenv('USE_HARDLINKS', 'false').lower() in ['true', '1', 'yes']
+
 def get_extras_max_size_mb():
     return int(os.getenv('EXTRAS_MAX_SIZE_MB', '100'))
 
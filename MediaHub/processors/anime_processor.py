@@ -2,11 +2,15 @@ import os
 import re
 import requests
 from utils.logging_utils import log_message
-from utils.file_utils import fetch_json, extract_resolution, extract_resolution_from_folder, get_anime_patterns
+from utils.file_utils import fetch_json, extract_resolution, extract_resolution_from_folder, get_anime_patterns, year_of
 from api.tmdb_api import search_tv_show, get_episode_name
 from config.config import *
 from utils.mediainfo import *
 
+# Read once at import, they do not change during a run
+_TMDB_FOLDER_ID = is_tmdb_folder_id_enabled()
+_IMDB_FOLDER_ID = is_imdb_folder_id_enabled()
+
 def is_anime_file(filename):
     """
     Detect if the file is likely an anime file based on naming patterns
@@ -156,9 +160,9 @@ def process_anime_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_i
         if tmdb_id_match:
             show_id = tmdb_id_match.group(1)
 
-    if is_tmdb_folder_id_enabled():
+    if _TMDB_FOLDER_ID:
         show_name = proper_show_name
-    elif is_imdb_folder_id_enabled():
+    elif _IMDB_FOLDER_ID:
         show_name = re.sub(r' \{tmdb-.*?\}$', '', proper_show_name)
     else:
         show_name = re.sub(r' \{(?:tmdb|imdb)-.*?\}$', '', proper_show_name)
@@ -193,7 +197,7 @@ def process_anime_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_i
             show_details = fetch_json(show_details_url)
             first_air_date = show_details.get('first_air_date', '')
             if first_air_date:
-                year = first_air_date.split('-')[0]
+                year = year_of(first_air_date)
         except Exception as e:
             log_message(f"Error fetching show year from TMDb: {e}", level="ERROR")
 
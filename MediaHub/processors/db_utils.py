@@ -6,6 +6,7 @@ import threading
 from functools import wraps
 from dotenv import load_dotenv, find_dotenv
 import sys
+import json
 import concurrent.futures
 
 # Load environment variables
@@ -21,6 +22,8 @@ DB_FILE = os.path.join(DB_DIR, "processed_files.db")
 ARCHIVE_DB_FILE = os.path.join(DB_DIR, "processed_files_archive.db")
 MAX_RECORDS = 100000
 LOCK_FILE = os.path.join(DB_DIR, "db_initialized.lock")
+TMDB_CACHE_FILE = os.path.join(DB_DIR, "tmdb_cache.db")
+TMDB_CACHE_TTL = 30 * 24 * 60 * 60
 
 # Get configuration from environment variables
 THROTTLE_RATE = float(os.getenv('DB_THROTTLE_RATE', 10))
@@ -60,6 +63,7 @@ class ConnectionPool:
 # Create connection pools
 main_pool = ConnectionPool(DB_FILE)
 archive_pool = ConnectionPool(ARCHIVE_DB_FILE)
+tmdb_cache_pool = ConnectionPool(TMDB_CACHE_FILE)
 
 def with_connection(pool):
     def decorator(func):
@@ -203,6 +207,22 @@ def save_processed_file(conn, source_path, dest_path):
         log_message(f"Error in save_processed_file: {e}", level="ERROR")
         conn.rollback()
 
+@throttle
+@retry_on_db_lock
+@with_connection(main_pool)
+def save_processed_files(conn, pairs):
+    """Save many (source_path, dest_path) pairs in one transaction."""
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT OR REPLACE INTO processed_files (file_path, destination_path)
+            VALUES (?, ?)
+        """, [(normalize_file_path(src), normalize_file_path(dest)) for src, dest in pairs])
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in save_processed_files: {e}", level="ERROR")
+        conn.rollback()
+
 @throttle
 @retry_on_db_lock
 @with_connection(main_pool)
@@ -377,3 +397,95 @@ def get_destination_path(conn, source_path):
         log_message(f"Error in get_destination_path: {e}", level="ERROR")
         conn.rollback()
         return None
+
+@retry_on_db_lock
+def initialize_tmdb_cache():
+    """Create the tables that persist TMDb lookups and raw responses across runs."""
+    os.makedirs(DB_DIR, exist_ok=True)
+    conn = tmdb_cache_pool.get_connection()
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tmdb_lookups (
+                media_type TEXT,
+                query TEXT,
+                year TEXT,
+                id_mode TEXT,
+                payload TEXT,
+                ts INTEGER,
+                PRIMARY KEY (media_type, query, year, id_mode)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tmdb_responses (
+                key TEXT PRIMARY KEY,
+                body BLOB,
+                ts INTEGER
+            )
+        """)
+        conn.commit()
+    except sqlite3.Error as e:
+        log_message(f"Failed to initialize TMDb cache: {e}", level="ERROR")
+        conn.rollback()
+    finally:
+        tmdb_cache_pool.return_connection(conn)
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def get_cached_lookup(conn, media_type, query, year, id_mode):
+    """Return a persisted TMDb lookup result, or None if missing or older than TMDB_CACHE_TTL."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT payload, ts FROM tmdb_lookups
+            WHERE media_type = ? AND query = ? AND year = ? AND id_mode = ?
+        """, (media_type, query, str(year or ''), id_mode))
+        result = cursor.fetchone()
+        if not result or time.time() - result[1] > TMDB_CACHE_TTL:
+            return None
+        return json.loads(result[0])
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_cached_lookup: {e}", level="ERROR")
+        return None
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def save_cached_lookup(conn, media_type, query, year, id_mode, payload):
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO tmdb_lookups (media_type, query, year, id_mode, payload, ts)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (media_type, query, str(year or ''), id_mode, json.dumps(payload), int(time.time())))
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in save_cached_lookup: {e}", level="ERROR")
+        conn.rollback()
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def get_cached_response(conn, key):
+    """Return a persisted raw TMDb response body, or None if missing or older than TMDB_CACHE_TTL."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT body, ts FROM tmdb_responses WHERE key = ?", (key,))
+        result = cursor.fetchone()
+        if not result or time.time() - result[1] > TMDB_CACHE_TTL:
+            return None
+        return result[0]
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_cached_response: {e}", level="ERROR")
+        return None
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def save_cached_response(conn, key, body):
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO tmdb_responses (key, body, ts)
+            VALUES (?, ?, ?)
+        """, (key, body, int(time.time())))
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in save_cached_response: {e}", level="ERROR")
+        conn.rollback()
@@ -17,6 +17,25 @@ global offline_mode
 # Retrieve base_dir and skip patterns from environment variables
 source_dirs = os.getenv('SOURCE_DIR', '').split(',')
 
+# Settings read once at import, they do not change during a run
+_TMDB_FOLDER_ID = is_tmdb_folder_id_enabled()
+_IMDB_FOLDER_ID = is_imdb_folder_id_enabled()
+_MOVIE_COLLECTIONS = is_movie_collection_enabled()
+_CINESYNC_LAYOUT = is_cinesync_layout_enabled()
+_SOURCE_STRUCTURE = is_source_structure_enabled()
+_RENAME_ENABLED = is_rename_enabled()
+_RENAME_TAGS = get_rename_tags()
+_SKIP_PATTERNS = is_skip_patterns_enabled()
+
+# Resolution folder for non-remux movies, keyed by the lowercased resolution tag
+_RESOLUTION_FOLDERS = {
+    '2160p': 'UltraHD',
+    '1080p': 'FullHD',
+    '720p': 'SDMovies',
+    '480p': 'Retro480p',
+    'DVD': 'DVDClassics'
+}
+
 def load_skip_patterns():
     """Load skip patterns from keywords.json in utils folder"""
     try:
@@ -36,7 +55,7 @@ def should_skip_file(filename):
     """
     Check if the file should be skipped based on patterns from keywords.json
     """
-    if not is_skip_patterns_enabled():
+    if not _SKIP_PATTERNS:
         return False
 
     for pattern in SKIP_PATTERNS:
@@ -77,18 +96,18 @@ def process_movie(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_ena
     collection_info = None
     api_key = get_api_key()
 
-    if api_key and is_movie_collection_enabled():
+    if api_key and _MOVIE_COLLECTIONS:
         result = search_movie(movie_name, year, auto_select=auto_select, actual_dir=actual_dir, file=file)
         if isinstance(result, (tuple, dict)):
             if isinstance(result, tuple):
                 tmdb_id, imdb_id, proper_name = result
             elif isinstance(result, dict):
                 proper_name = result['title']
-                year = result.get('release_date', '').split('-')[0]
+                year = year_of(result.get('release_date'), '')
                 tmdb_id = result['id']
 
             proper_movie_name = f"{proper_name} ({year})"
-            if is_tmdb_folder_id_enabled():
+            if _TMDB_FOLDER_ID:
                 proper_movie_name += f" {{tmdb-{tmdb_id}}}"
 
             tmdb_id_match = re.search(r'\{tmdb-(\d+)\}$', proper_movie_name)
@@ -104,15 +123,15 @@ def process_movie(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_ena
         if isinstance(result, tuple):
             tmdb_id, imdb_id, proper_name = result
             proper_movie_name = f"{movie_name} ({year})"
-            if is_tmdb_folder_id_enabled() and tmdb_id:
+            if _TMDB_FOLDER_ID and tmdb_id:
                 proper_movie_name += f" {{tmdb-{tmdb_id}}}"
-            if is_imdb_folder_id_enabled() and imdb_id:
+            if _IMDB_FOLDER_ID and imdb_id:
                 proper_movie_name += f" {{imdb-{imdb_id}}}"
         elif isinstance(result, dict):
-            proper_movie_name = f"{result['title']} ({result.get('release_date', '').split('-')[0]})"
-            if is_imdb_folder_id_enabled() and 'imdb_id' in result:
+            proper_movie_name = f"{result['title']} ({year_of(result.get('release_date'), '')})"
+            if _IMDB_FOLDER_ID and 'imdb_id' in result:
                 proper_movie_name += f" {{imdb-{result['imdb_id']}}}"
-            elif is_tmdb_folder_id_enabled():
+            elif _TMDB_FOLDER_ID:
                 proper_movie_name += f" {{tmdb-{result['id']}}}"
         else:
             proper_movie_name = f"{movie_name} ({year})"
@@ -122,30 +141,34 @@ def process_movie(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_ena
     log_message(f"Found movie: {proper_movie_name}", level="INFO")
     movie_folder = proper_movie_name.replace('/', '-')
 
-    if is_source_structure_enabled() or is_cinesync_layout_enabled():
-        if collection_info and is_movie_collection_enabled():
+    # Plain separator joins on the per-file path, without os.path.join's checks
+    dest_root = dest_dir.rstrip(os.sep) or dest_dir
+
+    if _SOURCE_STRUCTURE or _CINESYNC_LAYOUT:
+        if collection_info and _MOVIE_COLLECTIONS:
             collection_name, collection_id = collection_info
             log_message(f"Movie belongs to collection: {collection_name}", level="INFO")
             resolution_folder = 'Movie Collections'
             collection_folder = f"{collection_name} {{tmdb-{collection_id}}}"
-            dest_path = os.path.join(dest_dir, resolution_folder ,collection_folder, movie_folder)
+            dest_path = os.sep.join((dest_root, resolution_folder, collection_folder, movie_folder))
         else:
-            if is_cinesync_layout_enabled():
-                dest_path = os.path.join(dest_dir, 'Movies', movie_folder)
+            if _CINESYNC_LAYOUT:
+                dest_path = os.sep.join((dest_root, 'Movies', movie_folder))
             else:
+                # source_folder can be empty, which os.path.join skips
                 dest_path = os.path.join(dest_dir, source_folder, movie_folder)
     else:
-        if collection_info and is_movie_collection_enabled():
+        if collection_info and _MOVIE_COLLECTIONS:
             collection_name, collection_id = collection_info
             log_message(f"Movie belongs to collection: {collection_name}", level="INFO")
             resolution_folder = 'Movie Collections'
             collection_folder = f"{collection_name} {{tmdb-{collection_id}}}"
-            dest_path = os.path.join(dest_dir, 'Movies', resolution_folder, collection_folder, movie_folder)
+            dest_path = os.sep.join((dest_root, 'Movies', resolution_folder, collection_folder, movie_folder))
         else:
             collection_folder = None
             if tmdb_folder_id_enabled:
                 movie_folder = proper_movie_name
-            elif is_imdb_folder_id_enabled():
+            elif _IMDB_FOLDER_ID:
                 movie_folder = re.sub(r' \{tmdb-.*?\}$', '', proper_movie_name)
             else:
                 movie_folder = re.sub(r' \{(?:tmdb|imdb)-.*?\}$', '', proper_movie_name)
@@ -160,31 +183,27 @@ def process_movie(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_ena
 
         # Determine resolution-specific folder if not already set (for collections)
         if 'resolution_folder' not in locals():
-            resolution = extract_resolution_from_filename(file)
+            resolution, is_remux, is_4k, is_1080 = extract_resolution_tags(file)
 
             # Check for remux files first
-            if 'remux' in file.lower():
-                if '2160' in file or '4k' in file.lower():
+            if is_remux:
+                if is_4k:
                     resolution_folder = '4KRemux'
-                elif '1080' in file:
+                elif is_1080:
                     resolution_folder = '1080pRemux'
                 else:
                     resolution_folder = 'MoviesRemux'
+            elif resolution:
+                resolution_folder = _RESOLUTION_FOLDERS.get(resolution, 'Movies')
             else:
-                resolution_folder = {
-                    '2160p': 'UltraHD',
-                    '1080p': 'FullHD',
-                    '720p': 'SDMovies',
-                    '480p': 'Retro480p',
-                    'DVD': 'DVDClassics'
-                }.get(resolution.lower() if resolution else 'default_resolution', 'Movies')
+                resolution_folder = 'Movies'
 
         if collection_info:
-            dest_path = os.path.join(dest_dir, 'Movies', resolution_folder, collection_folder, movie_folder)
+            dest_path = os.sep.join((dest_root, 'Movies', resolution_folder, collection_folder, movie_folder))
         else:
-            dest_path = os.path.join(dest_dir, 'Movies', resolution_folder, movie_folder)
+            dest_path = os.sep.join((dest_root, 'Movies', resolution_folder, movie_folder))
 
-    os.makedirs(dest_path, exist_ok=True)
+    # The folder is created by process_file, which caches the folders it has made
 
     # Extract media information for renaming
     media_info = extract_media_info(file, keywords)
@@ -203,18 +222,16 @@ def process_movie(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_ena
             movie_folder += f" [Atmos]"
 
     # Initialize 'details' with media info extracted from the filename
-    details = extract_media_info(file, keywords)
-    details = [detail for detail in details if detail]
+    details = [detail for detail in media_info if detail]
 
     enhanced_movie_folder = f"{proper_movie_name} [{' '.join(details)}]".strip()
 
-    if is_rename_enabled() and get_rename_tags():
-        media_info = extract_media_info(file, keywords)
+    if _RENAME_ENABLED and _RENAME_TAGS:
         details = []
         id_tag = ''
 
         # Extract ID tag only if TMDB or IMDB is in RENAME_TAGS
-        rename_tags = get_rename_tags()
+        rename_tags = _RENAME_TAGS
         if 'TMDB' in rename_tags:
             id_tag_match = re.search(r'\{tmdb-\w+\}', proper_movie_name)
             id_tag = id_tag_match.group(0) if id_tag_match else ''
@@ -252,5 +269,5 @@ def process_movie(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_ena
     else:
         new_name = file
 
-    dest_file = os.path.join(dest_path, new_name)
+    dest_file = os.sep.join((dest_path, new_name))
     return dest_file
@@ -1,7 +1,7 @@
 import os
 import re
 import requests
-from utils.file_utils import extract_resolution_from_filename, extract_folder_year, clean_query, extract_year, extract_resolution_from_folder
+from utils.file_utils import extract_resolution_tags, extract_folder_year, clean_query, extract_year, extract_resolution_from_folder
 from api.tmdb_api import search_tv_show, get_episode_name
 from utils.logging_utils import log_message
 from config.config import *
@@ -13,6 +13,62 @@ from utils.mediainfo import *
 # Retrieve base_dir from environment variables
 source_dirs = os.getenv('SOURCE_DIR', '').split(',')
 
+# Settings read once at import, they do not change during a run
+_SKIP_EXTRAS = is_skip_extras_folder_enabled()
+_TMDB_FOLDER_ID = is_tmdb_folder_id_enabled()
+_IMDB_FOLDER_ID = is_imdb_folder_id_enabled()
+_CINESYNC_LAYOUT = is_cinesync_layout_enabled()
+_SOURCE_STRUCTURE = is_source_structure_enabled()
+_RENAME_ENABLED = is_rename_enabled()
+_RENAME_TAGS = get_rename_tags()
+_ANIME_SCAN = is_anime_scan()
+
+# Resolution-specific show folders
+_RESOLUTION_FOLDERS = {
+    '2160p': 'UltraHD',
+    '4k': 'UltraHD',
+    '1080p': 'FullHD',
+    '720p': 'SDClassics',
+    '480p': 'Retro480p',
+    'DVD': 'RetroDVD'
+}
+_SHOW_RESOLUTION_FOLDERS = ('UltraHD', 'FullHD', 'SDClassics', 'Retro480p', 'RetroDVD', 'Shows')
+
+# Existing show folders found under the resolution folders, keyed by (dest_root, show_folder),
+# so later episodes of a series skip the probe. Misses are not kept: the first episode may create the folder.
+_existing_show_folders = {}
+
+def clear_show_folder_cache():
+    """Forget found show folders, e.g. after empty folders were cleaned up between runs."""
+    _existing_show_folders.clear()
+
+# Patterns applied to every show file, compiled once at import
+_RE_SXXEXX = re.compile(r'S(\d+)E(\d+)')
+# Episode identifier formats, tried in this order at the start of the identifier.
+# Only the Ep form ignores case; the group that matched last names the format.
+_RE_EPISODE_ID = re.compile(
+    r'(?P<sxxexx>S\d{2}[eE]\d{2})'
+    r'|(?P<x_season>[0-9]+)x(?P<x_episode>[0-9]+)'
+    r'|(?P<sxx>S\d{2}[0-9]+)'
+    r'|(?P<e_format>[0-9]+e[0-9]+)'
+    r'|(?i:Ep\.?\s*(?P<ep>\d+))'
+)
+_RE_SEASON_SUFFIX = re.compile(r'\s*(S\d{2}.*|Season \d+).*')
+_RE_SEASON_TAG = re.compile(r'S(\d{2})', re.IGNORECASE)
+_RE_FOLDER_SEASON = re.compile(r'(?:S|Season)(\d+)', re.IGNORECASE)
+_RE_FIRST_NUMBER = re.compile(r'([0-9]+)')
+_RE_PARENT_SEASON = re.compile(r'S(\d{2})|Season\s*(\d+)', re.IGNORECASE)
+_RE_ANIME_EPISODE = re.compile(r'[-\s]E(\d+)\s')
+_RE_SEASON_WORD = re.compile(r'Season\s*(\d+)', re.IGNORECASE)
+_RE_TRAILING_JUNK = re.compile(r'\s+$|_+$|-+$|(\()$')
+_RE_TRAILING_YEAR_PAREN = re.compile(r'\(\d{4}\)$')
+_RE_TRAILING_YEAR = re.compile(r'\d{4}$')
+_RE_TMDB_TAG_SUFFIX = re.compile(r' \{tmdb-.*?\}$')
+_RE_ID_TAG_SUFFIX = re.compile(r' \{(?:tmdb|imdb)-.*?\}$')
+_RE_TMDB_ID_SUFFIX = re.compile(r'\{tmdb-(\d+)\}$')
+_RE_EPISODE_NUMBER = re.compile(r'E(\d+)')
+_RE_REPEATED_DASHES = re.compile(r'-{2,}')
+
 # Global variables to track API key state
 global api_key
 global api_warning_logged
@@ -47,7 +103,7 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
     create_extras_folder = False
     resolution = None
 
-    if is_anime_scan()  and is_anime_file(file):
+    if _ANIME_SCAN  and is_anime_file(file):
         anime_result = process_anime_show(src_file, root, file, dest_dir, actual_dir,
                                         tmdb_folder_id_enabled, rename_enabled, auto_select)
 
@@ -65,7 +121,7 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
         episode_number = anime_result.get('episode_number')
         resolution = anime_result.get('resolution')
 
-        episode_match = re.search(r'S(\d+)E(\d+)', new_name)
+        episode_match = _RE_SXXEXX.search(new_name)
         if episode_match:
             season_number = episode_match.group(1)
             episode_identifier = f"S{season_number}E{episode_match.group(2)}"
@@ -75,26 +131,28 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
     if not anime_result or episode_match:
         if episode_match:
             episode_identifier = episode_match.group(2)
-            if re.match(r'S\d{2}[eE]\d{2}', episode_identifier):
-                show_name = re.sub(r'\s*(S\d{2}.*|Season \d+).*', '', clean_folder_name).replace('-', ' ').replace('.', ' ').strip()
+            id_match = _RE_EPISODE_ID.match(episode_identifier)
+            id_format = id_match.lastgroup if id_match else None
+            if id_format == 'sxxexx':
+                show_name = _RE_SEASON_SUFFIX.sub('', clean_folder_name).replace('-', ' ').replace('.', ' ').strip()
                 create_season_folder = True
-            elif re.match(r'[0-9]+x[0-9]+', episode_identifier):
+            elif id_format == 'x_episode':
                 show_name = episode_match.group(1).replace('.', ' ').strip()
-                season_number = re.search(r'([0-9]+)x', episode_identifier).group(1)
-                episode_identifier = f"S{season_number}E{episode_identifier.split('x')[1]}"
+                season_number = id_match.group('x_season')
+                episode_identifier = f"S{season_number}E{id_match.group('x_episode')}"
                 create_season_folder = True
-            elif re.match(r'S\d{2}[0-9]+', episode_identifier):
+            elif id_format == 'sxx':
                 show_name = episode_match.group(1).replace('.', ' '). strip()
                 episode_identifier = f"S{episode_identifier[1:3]}E{episode_identifier[3:]}"
                 create_season_folder = True
-            elif re.match(r'[0-9]+e[0-9]+', episode_identifier):
+            elif id_format == 'e_format':
                 show_name = episode_match.group(1).replace('.', ' ').strip()
                 episode_identifier = f"S{episode_identifier[0:2]}E{episode_identifier[2:]}"
                 create_season_folder = True
-            elif re.match(r'Ep\.?\s*\d+', episode_identifier, re.IGNORECASE):
+            elif id_format == 'ep':
                 show_name = episode_match.group(1).replace('.', ' ').strip()
-                episode_number = re.search(r'Ep\.?\s*(\d+)', episode_identifier, re.IGNORECASE).group(1)
-                season_number = re.search(r'S(\d{2})', parent_folder_name, re.IGNORECASE)
+                episode_number = id_match.group('ep')
+                season_number = _RE_SEASON_TAG.search(parent_folder_name)
                 season_number = season_number.group(1) if season_number else "01"
                 episode_identifier = f"S{season_number}E{episode_number}"
                 create_season_folder = True
@@ -104,11 +162,11 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
                 create_extras_folder = True
 
             # Extract season number
-            season_match = re.search(r'(?:S|Season)(\d+)', clean_folder_name, re.IGNORECASE)
+            season_match = _RE_FOLDER_SEASON.search(clean_folder_name)
             if season_match:
                 season_number = season_match.group(1)
             else:
-                season_match = re.search(r'([0-9]+)', episode_identifier)
+                season_match = _RE_FIRST_NUMBER.search(episode_identifier)
                 season_number = season_match.group(1) if season_match else "01"
         else:
             # For non-episode files, use the parent folder name as the show name
@@ -116,7 +174,7 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
             show_name = clean_folder_name
 
             # Try to extract season number from the parent folder name
-            season_match = re.search(r'S(\d{2})|Season\s*(\d+)', clean_folder_name, re.IGNORECASE)
+            season_match = _RE_PARENT_SEASON.search(clean_folder_name)
             if season_match:
                 season_number = season_match.group(1) or season_match.group(2)
             else:
@@ -125,11 +183,11 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
             create_extras_folder = True
             episode_identifier = "S01E01"
 
-    anime_episode_pattern = re.search(r'[-\s]E(\d+)\s', file)
+    anime_episode_pattern = _RE_ANIME_EPISODE.search(file)
     if anime_episode_pattern:
         episode_number = anime_episode_pattern.group(1)
         episode_number = episode_number.zfill(2)
-        season_match = re.search(r'Season\s*(\d+)', file, re.IGNORECASE)
+        season_match = _RE_SEASON_WORD.search(file)
         if season_match:
             season_number = season_match.group(1).zfill(2)
         episode_identifier = f"S{season_number}E{episode_number}"
@@ -137,16 +195,16 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
     # Handle invalid show names by using parent folder name
     if not show_name or show_name.lower() in ["invalid name", "unknown"]:
         show_name = clean_folder_name
-        show_name = re.sub(r'\s+$|_+$|-+$|(\()$', '', show_name).replace('.', ' ').strip()
+        show_name = _RE_TRAILING_JUNK.sub('', show_name).replace('.', ' ').strip()
 
     # Handle special cases for show names
-    show_folder = re.sub(r'\s+$|_+$|-+$|(\()$', '', show_name).rstrip()
+    show_folder = _RE_TRAILING_JUNK.sub('', show_name).rstrip()
 
     # Handle year extraction and appending if necessary
     year = extract_folder_year(parent_folder_name) or extract_year(show_folder)
     if year:
-        show_folder = re.sub(r'\(\d{4}\)$', '', show_folder).strip()
-        show_folder = re.sub(r'\d{4}$', '', show_folder).strip()
+        show_folder = _RE_TRAILING_YEAR_PAREN.sub('', show_folder).strip()
+        show_folder = _RE_TRAILING_YEAR.sub('', show_folder).strip()
 
     if anime_result:
         show_folder = anime_result.get('show_name', '')
@@ -161,91 +219,93 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
             log_message(f"Could not find TV show in TMDb or TMDb API error: {show_folder} ({year})", level="ERROR")
             proper_show_name = show_folder
 
-        if is_tmdb_folder_id_enabled():
+        if _TMDB_FOLDER_ID:
             show_folder = proper_show_name
-        elif is_imdb_folder_id_enabled():
-            show_folder = re.sub(r' \{tmdb-.*?\}$', '', proper_show_name)
+        elif _IMDB_FOLDER_ID:
+            show_folder = _RE_TMDB_TAG_SUFFIX.sub('', proper_show_name)
         else:
-            show_folder = re.sub(r' \{(?:tmdb|imdb)-.*?\}$', '', proper_show_name)
+            show_folder = _RE_ID_TAG_SUFFIX.sub('', proper_show_name)
     else:
         show_folder = show_folder
 
     show_folder = show_folder.replace('/', '')
 
     # Determine resolution-specific folder for shows
+    file_resolution, is_remux, is_4k, is_1080 = extract_resolution_tags(file)
     if anime_result and anime_result.get('resolution'):
         resolution = anime_result['resolution']
     else:
-        resolution = extract_resolution_from_filename(file) or extract_resolution_from_folder(parent_folder_name)
+        resolution = file_resolution or extract_resolution_from_folder(parent_folder_name)
         if not resolution:
             log_message(f"Resolution could not be extracted from filename or folder name. Defaulting to 'Shows'.", level="DEBUG")
             resolution = 'Shows'
 
     # Resolution folder determination logic remains the same as in original code
-    if 'remux' in file.lower():
-        if '2160' in file or '4k' in file.lower():
+    if is_remux:
+        if is_4k:
             resolution_folder = 'UltraHDRemuxShows'
-        elif '1080' in file:
+        elif is_1080:
             resolution_folder = '1080pRemuxLibrary'
         else:
             resolution_folder = 'RemuxShows'
     else:
-        resolution_folder = {
-            '2160p': 'UltraHD',
-            '4k': 'UltraHD',
-            '1080p': 'FullHD',
-            '720p': 'SDClassics',
-            '480p': 'Retro480p',
-            'DVD': 'RetroDVD'
-        }.get(resolution.lower(), 'Shows')
+        resolution_folder = _RESOLUTION_FOLDERS.get(resolution.lower(), 'Shows')
+
+    # Plain separator joins on the per-file path, without os.path.join's checks
+    dest_root = dest_dir.rstrip(os.sep) or dest_dir
 
     # Destination path determination
-    if is_cinesync_layout_enabled():
-        base_dest_path = os.path.join(dest_dir, 'Shows', show_folder)
-        extras_base_dest_path = os.path.join(dest_dir, 'Shows', show_folder)
-    elif is_source_structure_enabled():
+    if _CINESYNC_LAYOUT:
+        base_dest_path = os.sep.join((dest_root, 'Shows', show_folder))
+        extras_base_dest_path = os.sep.join((dest_root, 'Shows', show_folder))
+    elif _SOURCE_STRUCTURE:
+        # source_folder can be empty, which os.path.join skips
         base_dest_path = os.path.join(dest_dir, source_folder, show_folder)
         extras_base_dest_path = os.path.join(dest_dir, source_folder, show_folder)
     else:
-        base_dest_path = os.path.join(dest_dir, 'Shows', resolution_folder, show_folder)
-        extras_base_dest_path = os.path.join(dest_dir, 'Shows', 'Extras', show_folder)
+        base_dest_path = os.sep.join((dest_root, 'Shows', resolution_folder, show_folder))
+        extras_base_dest_path = os.sep.join((dest_root, 'Shows', 'Extras', show_folder))
 
     # Use anime season number if available, otherwise use the default season handling
     if anime_result:
-        season_dest_path = os.path.join(base_dest_path, f"Season {int(anime_result.get('season_number', '01'))}")
+        season_dest_path = os.sep.join((base_dest_path, f"Season {int(anime_result.get('season_number', '01'))}"))
     else:
-        season_dest_path = os.path.join(base_dest_path, f"Season {int(season_number)}")
+        season_dest_path = os.sep.join((base_dest_path, f"Season {int(season_number)}"))
 
-    extras_dest_path = os.path.join(extras_base_dest_path, 'Extras')
+    extras_dest_path = os.sep.join((extras_base_dest_path, 'Extras'))
 
     # Function to check if show folder exists in any resolution folder
     def find_show_folder_in_resolution_folders():
-        for res_folder in ['UltraHD', 'FullHD', 'SDClassics', 'Retro480p', 'RetroDVD', 'Shows']:
-            show_folder_path = os.path.join(dest_dir, 'Shows', res_folder, show_folder)
+        show_folder_path = _existing_show_folders.get((dest_root, show_folder))
+        if show_folder_path:
+            return show_folder_path
+        for res_folder in _SHOW_RESOLUTION_FOLDERS:
+            show_folder_path = os.sep.join((dest_root, 'Shows', res_folder, show_folder))
             if os.path.isdir(show_folder_path):
+                _existing_show_folders[(dest_root, show_folder)] = show_folder_path
                 return show_folder_path
         return None
 
     # Check for existing show folder and update paths
     existing_show_folder_path = find_show_folder_in_resolution_folders()
     if existing_show_folder_path:
-        extras_dest_path = os.path.join(existing_show_folder_path, 'Extras')
+        extras_dest_path = os.sep.join((existing_show_folder_path, 'Extras'))
 
     # Check if SKIP_EXTRAS_FOLDER is enabled and handle accordingly
-    if is_skip_extras_folder_enabled() and is_file_extra(file, src_file):
+    if _SKIP_EXTRAS and is_file_extra(file, src_file):
         log_message(f"Skipping extras file: {file} based on size and SKIP_EXTRAS_FOLDER setting", level="INFO")
         return None
 
     # Extract media information and Rename files
     media_info = extract_media_info(file, keywords)
     if anime_result and rename_enabled:
-        dest_file = os.path.join(season_dest_path, new_name)
+        dest_file = os.sep.join((season_dest_path, new_name))
     else:
         if episode_identifier and rename_enabled:
-            tmdb_id_match = re.search(r'\{tmdb-(\d+)\}$', proper_show_name)
+            tmdb_id_match = _RE_TMDB_ID_SUFFIX.search(proper_show_name)
             if tmdb_id_match:
                 show_id = tmdb_id_match.group(1)
-                episode_number_match = re.search(r'E(\d+)', episode_identifier)
+                episode_number_match = _RE_EPISODE_NUMBER.search(episode_identifier)
 
                 if episode_number_match:
                     episode_number = episode_number_match.group(1)
@@ -261,11 +321,12 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
             else:
                 base_name = f"{show_name} - {episode_identifier}"
 
-            if is_rename_enabled() and get_rename_tags():
-                media_info = extract_media_info(file, keywords)
+            ext = os.path.splitext(file)[1]
+            if _RENAME_ENABLED and _RENAME_TAGS:
+                # media_info was extracted from this file above
                 details = []
 
-                for tag in get_rename_tags():
+                for tag in _RENAME_TAGS:
                     tag = tag.strip()
                     if tag in media_info:
                         value = media_info[tag]
@@ -276,13 +337,13 @@ def process_show(src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enab
                         else:
                             details.append(f"[{value}]")
 
-                new_name = f"{base_name} {''.join(details)}{os.path.splitext(file)[1]}"
+                new_name = f"{base_name} {''.join(details)}{ext}"
             else:
-                new_name = f"{base_name}{os.path.splitext(file)[1]}"
+                new_name = f"{base_name}{ext}"
 
-            new_name = re.sub(r'-{2,}', '-', new_name).strip('-')
-            dest_file = os.path.join(season_dest_path, new_name)
+            new_name = _RE_REPEATED_DASHES.sub('-', new_name).strip('-')
+            dest_file = os.sep.join((season_dest_path, new_name))
         else:
-            dest_file = os.path.join(season_dest_path, file)
+            dest_file = os.sep.join((season_dest_path, file))
 
     return dest_file
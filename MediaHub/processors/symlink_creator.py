@@ -1,13 +1,14 @@
 import os
 import re
+import errno
 import traceback
 import sqlite3
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from multiprocessing import cpu_count
-from threading import Event
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from threading import Event, Lock, local
 from processors.movie_processor import process_movie
-from processors.show_processor import process_show
-from utils.logging_utils import log_message
+from processors.show_processor import process_show, clear_show_folder_cache
+from utils.logging_utils import log_message, log_enabled
 from utils.file_utils import build_dest_index, get_anime_patterns, is_file_extra, skip_files
 from config.config import *
 from processors.db_utils import *
@@ -16,14 +17,151 @@ error_event = Event()
 log_imported_db = False
 db_initialized = False
 
+# Read once at import, it does not change during a run
+_SKIP_EXTRAS = is_skip_extras_folder_enabled()
+_USE_HARDLINKS = is_hardlinks_enabled()
+
+# Episode tags; group(1) is the title before the tag and group(2) the tag, both used by process_show
+_EPISODE_RE = re.compile(r'(.*?)(S\d{2}\.E\d{2}|S\d{2}E\d{2}|S\d{2}e\d{2}|[0-9]+x[0-9]+|S\d{2}[0-9]+|[0-9]+e[0-9]+|\bep\.?\s*\d{1,2}\b|\bEp\.?\s*\d{1,2}\b|\bEP\.?\s*\d{1,2}\b|S\d{2}\sE\d{2}|MINI[- ]SERIES|MINISERIES|\s-\s\d{2,3}|\s-\d{2,3}|\s-\s*\d{2,3}|[Ee]pisode\s*\d{2}|[Ee]p\s*\d{2}|Season_-\d{2}|\bSeason\d+\b|\bE\d+\b)', re.IGNORECASE)
+_MINI_SERIES_RE = re.compile(r'(MINI[- ]SERIES|MINISERIES)', re.IGNORECASE)
+
+# Episode and mini-series tags counted by determine_is_show
+_SHOW_FILE_RE = re.compile(r'(S\d{2}\.E\d{2}|S\d{2}E\d{2}|S\d{2}e\d{2}|[0-9]+x[0-9]+|S\d{2}[0-9]+|[0-9]+e[0-9]+|\bep\.?\s*\d{1,2}\b|\bEp\.?\s*\d{1,2}\b|\bEP\.?\s*\d{1,2}\b|S\d{2}\sE\d{2}|MINI[- ]SERIES|MINISERIES|Season_-\d{2})', re.IGNORECASE)
+
+# Destination folders already created during this run, so makedirs runs once per folder
+_created_dirs = set()
+_created_dirs_lock = Lock()
+
+# Processed files waiting to be written to the database in one transaction
+_pending_saves = []
+_pending_saves_lock = Lock()
+_SAVE_BATCH = 64
+
+# Where symlinkat is available, each worker keeps an O_PATH handle on the folder it last
+# linked into, so files of the same season skip resolving the full destination path
+_USE_DIR_FD = os.symlink in os.supports_dir_fd and hasattr(os, 'O_PATH')
+_worker_dir_fd = local()
+_open_dir_fds = set()
+_open_dir_fds_lock = Lock()
+
+# File tasks submitted but not yet collected; the scan waits once this many are pending
+_MAX_IN_FLIGHT = 1024
+
+# Directories scanned concurrently while walking a source tree
+_SCAN_WORKERS = 8
+_SORT_BY_INODE = os.name != 'nt'
+
+# Season tag such as S01 anywhere in a path component
+_SEASON_RE = re.compile(r'\b(s\d{2})\b', re.IGNORECASE)
+
+def flush_processed_files():
+    """Write any buffered processed-file records to the database."""
+    with _pending_saves_lock:
+        pairs = _pending_saves[:]
+        _pending_saves.clear()
+    if pairs:
+        save_processed_files(pairs)
+
+def record_processed_file(src_file, dest_file):
+    """Buffer a processed-file record, flushing once a batch is full."""
+    with _pending_saves_lock:
+        _pending_saves.append((src_file, dest_file))
+        full = len(_pending_saves) >= _SAVE_BATCH
+    if full:
+        flush_processed_files()
+
+def _symlink(src_file, dest_file):
+    """os.symlink, relative to the calling worker's cached destination folder handle when possible."""
+    if not _USE_DIR_FD:
+        os.symlink(src_file, dest_file)
+        return
+
+    dest_parent, name = os.path.split(dest_file)
+    cached = getattr(_worker_dir_fd, 'entry', None)
+    if cached is None or cached[0] != dest_parent:
+        fd = os.open(dest_parent, os.O_PATH | os.O_DIRECTORY)
+        with _open_dir_fds_lock:
+            if cached is not None:
+                _open_dir_fds.discard(cached[1])
+                os.close(cached[1])
+            _open_dir_fds.add(fd)
+        cached = _worker_dir_fd.entry = (dest_parent, fd)
+    os.symlink(src_file, name, dir_fd=cached[1])
+
+# st_dev of destination folders, cleared each run since mounts can change in between
+_device_cache = {}
+
+# os.link failures that mean "cannot hardlink here" rather than a real error
+_NO_HARDLINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+def _device_of(path):
+    """st_dev of a destination folder, looked up once per folder."""
+    device = _device_cache.get(path)
+    if device is None:
+        device = _device_cache[path] = os.stat(path).st_dev
+    return device
+
+def _create_link(src_file, dest_file, entry):
+    """
+    Link dest_file to src_file. With USE_HARDLINKS, a source on the same filesystem as
+    the destination folder is hardlinked; everything else is symlinked, including files
+    a nested mount or a filesystem without hardlinks refuses to link. Returns the link kind.
+    """
+    if _USE_HARDLINKS:
+        src_device = entry.stat().st_dev if entry is not None else os.stat(src_file).st_dev
+        if src_device == _device_of(os.path.dirname(dest_file)):
+            try:
+                os.link(src_file, dest_file)
+                return "hardlink"
+            except OSError as e:
+                if e.errno not in _NO_HARDLINK_ERRNOS:
+                    raise
+                log_message(f"Cannot hardlink {src_file} ({e.strerror}), creating a symlink instead", level="DEBUG")
+    _symlink(src_file, dest_file)
+    return "symlink"
+
+def close_dir_fds():
+    """Close the destination folder handles once the workers have finished."""
+    with _open_dir_fds_lock:
+        for fd in _open_dir_fds:
+            os.close(fd)
+        _open_dir_fds.clear()
+
+def wait_for_task(future):
+    """Collect a finished file task, logging anything process_file let escape."""
+    try:
+        future.result()
+    except Exception as e:
+        log_message(f"Task failed with exception: {e}\n{traceback.format_exc()}", level="ERROR")
+
+def record_existing_symlink(src_file, file, existing_symlink):
+    """Record a source file whose symlink is already in the destination."""
+    log_message(f"Symlink already exists for {os.path.basename(file)}", level="INFO")
+    log_message(f"Attempting to save {src_file} to the database.", level="INFO")
+    record_processed_file(src_file, existing_symlink)
+
 def delete_broken_symlinks(dest_dir):
     """Delete broken symlinks in the destination directory and recursively delete empty parent folders."""
     symlinks_deleted = False
 
-    for root, _, files in os.walk(dest_dir):
-        for file in files:
-            file_path = os.path.join(root, file)
-            if os.path.islink(file_path):
+    # scandir reports symlinks from the directory listing itself, so only links cost a readlink
+    pending = [dest_dir]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        for entry in entries:
+            # Like os.walk, symlinked directories are not descended into
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    pending.append(entry.path)
+                continue
+
+            if entry.is_symlink():
+                file_path = entry.path
                 target = os.readlink(file_path)
 
                 # Check if the symlink target exists
@@ -47,6 +185,43 @@ def delete_broken_symlinks(dest_dir):
                         os.rmdir(dir_path)
                         dir_path = os.path.dirname(dir_path)
 
+def _scan_source_dir(path):
+    """List one directory, returning (path, file entries, subdirectory paths)."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    files.append(entry)
+    except OSError:
+        pass
+    # Inode order is closer to on-disk layout than readdir order; the inode is free on POSIX,
+    # while on Windows it would cost a stat per entry
+    if _SORT_BY_INODE:
+        files.sort(key=lambda entry: entry.inode())
+    return path, files, subdirs
+
+def iter_source_files(src_dir):
+    """
+    Yield (src_file, root, file, entry) for every file under src_dir using os.scandir,
+    so the DirEntry's cached file type and stat can be reused downstream.
+    Directories are listed concurrently on a small pool, which keeps slow or remote mounts
+    from starving the file workers; files of one directory are still yielded together.
+    Like os.walk, symlinked directories are not descended into and unreadable directories are skipped.
+    """
+    with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as pool:
+        pending = {pool.submit(_scan_source_dir, src_dir)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                root, files, subdirs = future.result()
+                pending.update(pool.submit(_scan_source_dir, subdir) for subdir in subdirs)
+                for entry in files:
+                    yield entry.path, root, entry.name, entry
+
 def determine_is_show(path):
     """
     Determine if a path contains TV shows, mini-series, or anime based on episode patterns or keywords.
@@ -60,12 +235,13 @@ def determine_is_show(path):
         bool: True if the path contains TV shows/anime content, False otherwise
     """
     # Regular TV show and mini-series patterns
-    episode_patterns = re.compile(r'(S\d{2}\.E\d{2}|S\d{2}E\d{2}|S\d{2}e\d{2}|[0-9]+x[0-9]+|S\d{2}[0-9]+|[0-9]+e[0-9]+|\bep\.?\s*\d{1,2}\b|\bEp\.?\s*\d{1,2}\b|\bEP\.?\s*\d{1,2}\b|S\d{2}\sE\d{2}|MINI[- ]SERIES|MINISERIES|Season_-\d{2})', re.IGNORECASE)
+    episode_patterns = _SHOW_FILE_RE
 
     # Get anime patterns
     anime_patterns = get_anime_patterns()
     match_count = 0
     threshold = 2
+    debug = log_enabled("DEBUG")
 
     # First check if the path itself matches any patterns
     if os.path.isfile(path):
@@ -87,20 +263,24 @@ def determine_is_show(path):
                 continue
 
             if skip_files(file):
-                log_message(f"Skipping file {file} due to its extension.", level="DEBUG")
+                if debug:
+                    log_message(f"Skipping file {file} due to its extension.", level="DEBUG")
                 continue
 
-            log_message(f"Checking file: {file}", level="DEBUG")
+            if debug:
+                log_message(f"Checking file: {file}", level="DEBUG")
 
             # Check for TV show/mini-series patterns
             if episode_patterns.search(file):
-                log_message(f"File '{file}' matches episode pattern.", level="DEBUG")
+                if debug:
+                    log_message(f"File '{file}' matches episode pattern.", level="DEBUG")
                 match_count += 1
             # Check for anime patterns
             elif anime_patterns.search(file):
-                log_message(f"File '{file}' matches anime pattern.", level="DEBUG")
+                if debug:
+                    log_message(f"File '{file}' matches anime pattern.", level="DEBUG")
                 match_count += 1
-            else:
+            elif debug:
                 log_message(f"File '{file}' does not match any pattern.", level="DEBUG")
 
             if match_count >= threshold:
@@ -111,13 +291,30 @@ def determine_is_show(path):
 
     return match_count >= threshold
 
+def is_show_root(path):
+    """
+    Fallback TV show check for a source directory (or a single file), evaluated once
+    per directory by create_symlinks rather than once per file.
+    """
+    return bool(_SEASON_RE.search(path)) or determine_is_show(path)
+
 def process_file(args, processed_files_log):
-    src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index = args
+    src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index_future, entry, show_root = args
 
     if error_event.is_set():
         return
 
-    skip_extras_folder = is_skip_extras_folder_enabled()
+    # The destination index is built in the background while the sources are scanned
+    dest_index = dest_index_future.result()
+
+    skip_extras_folder = _SKIP_EXTRAS
+
+    # A symlink already pointing at this file settles it with one dict probe, before the
+    # throttled database lookup; re-recording also repairs a row whose link was renamed
+    existing_symlink = dest_index.get(src_file)
+    if existing_symlink:
+        record_existing_symlink(src_file, file, existing_symlink)
+        return
 
     existing_dest_path = get_destination_path(src_file)
     if existing_dest_path:
@@ -126,48 +323,31 @@ def process_file(args, processed_files_log):
             # File might have been renamed, let's check the directory
             dir_path = os.path.dirname(existing_dest_path)
             if os.path.exists(dir_path):
-                for filename in os.listdir(dir_path):
-                    potential_new_path = os.path.join(dir_path, filename)
-                    if os.path.islink(potential_new_path) and os.readlink(potential_new_path) == src_file:
-                        # Found the renamed file
-                        log_message(f"Detected renamed file: {existing_dest_path} -> {potential_new_path}", level="INFO")
-                        update_renamed_file(existing_dest_path, potential_new_path)
-                        return
+                with os.scandir(dir_path) as entries:
+                    potential_new_path = next((e.path for e in entries
+                                               if e.is_symlink() and os.readlink(e.path) == src_file), None)
+                if potential_new_path:
+                    # Found the renamed file
+                    log_message(f"Detected renamed file: {existing_dest_path} -> {potential_new_path}", level="INFO")
+                    update_renamed_file(existing_dest_path, potential_new_path)
+                    return
 
             log_message(f"Destination file missing. Re-processing: {src_file}", level="INFO")
         else:
             log_message(f"File already processed. Source: {src_file}, Existing destination: {existing_dest_path}", level="INFO")
             return
 
-    # Check if a symlink already exists
-    existing_symlink = next((full_dest_file for full_dest_file in dest_index
-                             if os.path.islink(full_dest_file) and os.readlink(full_dest_file) == src_file), None)
-
-    if existing_symlink:
-        log_message(f"Symlink already exists for {os.path.basename(file)}", level="INFO")
-        log_message(f"Attempting to save {src_file} to the database.", level="INFO")
-        save_processed_file(src_file, existing_symlink)
-        return
-
     # Enhanced Regex Patterns to Identify Shows or Mini-Series
-    episode_match = re.search(r'(.*?)(S\d{2}\.E\d{2}|S\d{2}E\d{2}|S\d{2}e\d{2}|[0-9]+x[0-9]+|S\d{2}[0-9]+|[0-9]+e[0-9]+|\bep\.?\s*\d{1,2}\b|\bEp\.?\s*\d{1,2}\b|\bEP\.?\s*\d{1,2}\b|S\d{2}\sE\d{2}|MINI[- ]SERIES|MINISERIES|\s-\s\d{2,3}|\s-\d{2,3}|\s-\s*\d{2,3}|[Ee]pisode\s*\d{2}|[Ee]p\s*\d{2}|Season_-\d{2}|\bSeason\d+\b|\bE\d+\b)', file, re.IGNORECASE)
-
-    mini_series_match = re.search(r'(MINI[- ]SERIES|MINISERIES)', file, re.IGNORECASE)
-    anime_episode_pattern = re.compile(r'\s-\s\d{2,3}\s', re.IGNORECASE)
-
-    # Get additional anime patterns
-    other_anime_patterns = get_anime_patterns()
+    episode_match = _EPISODE_RE.search(file)
 
-    # Fallback logic to determine if the folder is a TV show directory
-    season_pattern = re.compile(r'\b(s\d{2})\b', re.IGNORECASE)
-    is_show_directory = bool(season_pattern.search(src_file))
+    mini_series_match = _MINI_SERIES_RE.search(file)
 
-    if not is_show_directory and not episode_match and not mini_series_match:
-        is_show_directory = determine_is_show(src_file)
+    # Fallback logic to determine if the folder is a TV show directory, precomputed per root
+    is_show_directory = show_root or bool(_SEASON_RE.search(file))
 
     try:
         # Check if the file should be considered an extra based on size
-        if skip_extras_folder and is_file_extra(file, src_file):
+        if skip_extras_folder and is_file_extra(file, src_file, entry):
             log_message(f"Skipping extras file: {file} based on size", level="DEBUG")
             return
 
@@ -189,29 +369,39 @@ def process_file(args, processed_files_log):
             return
 
         # Ensure the destination directory exists
-        os.makedirs(os.path.dirname(dest_file), exist_ok=True)
-
-        # Check if symlink already exists
-        if os.path.islink(dest_file):
-            existing_src = os.readlink(dest_file)
-            if existing_src == src_file:
-                log_message(f"Symlink already exists and is correct: {dest_file} -> {src_file}", level="INFO")
-                save_processed_file(src_file, dest_file)
-                return
-            else:
+        dest_parent = os.path.dirname(dest_file)
+        if dest_parent not in _created_dirs:
+            os.makedirs(dest_parent, exist_ok=True)
+            with _created_dirs_lock:
+                _created_dirs.add(dest_parent)
+
+        # Create symlink, only inspecting the destination when something is already there
+        try:
+            try:
+                link_kind = _create_link(src_file, dest_file, entry)
+            except FileExistsError:
+                try:
+                    existing_src = os.readlink(dest_file)
+                except OSError:
+                    if _USE_HARDLINKS and os.path.samefile(src_file, dest_file):
+                        log_message(f"Hardlink already exists and is correct: {dest_file} -> {src_file}", level="INFO")
+                        record_processed_file(src_file, dest_file)
+                        return
+                    log_message(f"File already exists at destination: {os.path.basename(dest_file)}", level="INFO")
+                    return
+
+                if existing_src == src_file:
+                    log_message(f"Symlink already exists and is correct: {dest_file} -> {src_file}", level="INFO")
+                    record_processed_file(src_file, dest_file)
+                    return
+
                 log_message(f"Updating existing symlink: {dest_file} -> {src_file} (was: {existing_src})", level="INFO")
                 os.remove(dest_file)
+                link_kind = _create_link(src_file, dest_file, entry)
 
-        if os.path.exists(dest_file) and not os.path.islink(dest_file):
-            log_message(f"File already exists at destination: {os.path.basename(dest_file)}", level="INFO")
-            return
-
-        # Create symlink
-        try:
-            os.symlink(src_file, dest_file)
-            log_message(f"Created symlink: {dest_file} -> {src_file}", level="DEBUG")
+            log_message(f"Created {link_kind}: {dest_file} -> {src_file}", level="DEBUG")
             log_message(f"Processed file: {src_file} to {dest_file}", level="INFO")
-            save_processed_file(src_file, dest_file)
+            record_processed_file(src_file, dest_file)
 
         except FileExistsError:
             log_message(f"File already exists: {dest_file}. Skipping symlink creation.", level="WARNING")
@@ -241,8 +431,14 @@ def create_symlinks(src_dirs, dest_dir, auto_select=False, single_path=None):
     # Delete broken symlinks before starting the scan
     delete_broken_symlinks(dest_dir)
 
-    tasks = []
-    with ThreadPoolExecutor(max_workers=cpu_count()) as executor:
+    # That cleanup may remove empty folders, so forget what earlier runs created or found
+    with _created_dirs_lock:
+        _created_dirs.clear()
+    _device_cache.clear()
+    clear_show_folder_cache()
+
+    def file_tasks(dest_index):
+        """Yield process_file args one at a time so no list of pending work is built up front."""
         for src_dir in src_dirs:
             if os.path.isfile(src_dir):
                 # Handle single file
@@ -250,37 +446,57 @@ def create_symlinks(src_dirs, dest_dir, auto_select=False, single_path=None):
                 root = os.path.dirname(src_file)
                 file = os.path.basename(src_file)
                 actual_dir = os.path.basename(root)
-                args = (src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, build_dest_index(dest_dir))
-                tasks.append(executor.submit(process_file, args, processed_files_log))
+                yield (src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index, None, is_show_root(src_file))
             else:
                 # Handle directory
                 actual_dir = os.path.basename(os.path.normpath(src_dir))
                 log_message(f"Scanning source directory: {src_dir} (actual: {actual_dir})", level="INFO")
 
-                files_to_process = []
-                dest_index = build_dest_index(dest_dir)  # Ensure dest_index is properly initialized
+                current_root = None
 
-                for root, _, files in os.walk(src_dir):
-                    for file in files:
-                        if error_event.is_set():
-                            log_message("Stopping further processing due to an earlier error.", level="WARNING")
-                            return
+                for src_file, root, file, entry in iter_source_files(src_dir):
+                    if error_event.is_set():
+                        log_message("Stopping further processing due to an earlier error.", level="WARNING")
+                        return
 
-                        src_file = os.path.join(root, file)
+                    # Check if the file is an extra based on the size
+                    if skip_extras_folder and is_file_extra(file, src_file, entry):
+                        log_message(f"Skipping extras file: {file}", level="DEBUG")
+                        continue
 
-                        # Check if the file is an extra based on the size
-                        if skip_extras_folder and is_file_extra(file, src_file):
-                            log_message(f"Skipping extras file: {file}", level="DEBUG")
-                            continue
+                    if src_file in processed_files_log:
+                        continue
 
-                        if src_file in processed_files_log:
+                    # Once the destination index is ready, already-linked files are recorded
+                    # here and never reach the pool; until then the workers check them
+                    if dest_index.done():
+                        existing_symlink = dest_index.result().get(src_file)
+                        if existing_symlink:
+                            record_existing_symlink(src_file, file, existing_symlink)
                             continue
 
-                        args = (src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index)
-                        tasks.append(executor.submit(process_file, args, processed_files_log))
+                    # Files arrive grouped by directory, so the show check runs once per root
+                    if root != current_root:
+                        current_root = root
+                        show_root = is_show_root(root)
 
-    # Wait for all tasks to complete
-    for task in as_completed(tasks):
-        if error_event.is_set():
-            log_message("Error detected during task execution. Stopping all tasks.", level="WARNING")
-            return
+                    yield (src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index, entry, show_root)
+
+    # A bounded window of pending tasks keeps memory flat and backpressures the scan.
+    with ThreadPoolExecutor(max_workers=FILE_WORKERS) as executor:
+        # Scan the destination on a worker so source scanning starts right away
+        dest_index = executor.submit(build_dest_index, dest_dir)
+        in_flight = deque()
+        for args in file_tasks(dest_index):
+            if len(in_flight) >= _MAX_IN_FLIGHT:
+                wait_for_task(in_flight.popleft())
+            in_flight.append(executor.submit(process_file, args, processed_files_log))
+
+        while in_flight:
+            wait_for_task(in_flight.popleft())
+
+    close_dir_fds()
+    flush_processed_files()
+
+    if error_event.is_set():
+        log_message("Error detected during task execution. Stopping all tasks.", level="WARNING")
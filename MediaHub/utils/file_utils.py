@@ -2,91 +2,149 @@ import re
 import os
 import json
 import inspect
+import threading
+from functools import lru_cache
 import requests
-from utils.logging_utils import log_message
+from utils.logging_utils import log_message, log_enabled, flush_logs
+from utils.http_utils import http_session, REQUEST_TIMEOUT
 from config.config import *
 
+# Patterns used on every filename, compiled once at import
+_RE_YEAR_PAREN_END = re.compile(r'\((\d{4})\)$')
+_RE_YEAR_END = re.compile(r'(\d{4})$')
+_RE_YEAR_PAREN = re.compile(r'\((\d{4})\)')
+_RE_YEAR_DOTTED = re.compile(r'\.(\d{4})\.')
+_RE_RESOLUTION_PATTERNS = (
+    re.compile(r'(\d{3,4}p)', re.IGNORECASE),
+    re.compile(r'(\d{3,4}x\d{3,4})', re.IGNORECASE),
+)
+_RE_RESOLUTION_TAG = re.compile(r'(2160p|1080p|720p|480p|2160|1080|720|480)', re.IGNORECASE)
+_RE_REMUX = re.compile(r'(Remux)', re.IGNORECASE)
+# Resolution, remux and 4k tags in one scan; none of them can overlap the start of another
+_RE_RESOLUTION_TOKENS = re.compile(r'2160p|1080p|720p|480p|2160|1080|720|480|remux|4k', re.IGNORECASE)
+_RE_LIST_NUMBER_PREFIX = re.compile(r'^\d{1,2}\.\s+')
+# Year tokens in order of preference: [YYYY], (YYYY), then a bare YYYY
+_RE_YEAR_TOKEN = re.compile(r'\[(\d{4})\]|\((\d{4})\)|(\d{4})')
+_MOVIE_NAME_TABLE = str.maketrans({'.': ' ', '-': ' ', '[': None, ']': None})
+_RE_WEBSITE_PREFIX = re.compile(r'(?:www\.\S+\.\S+\s*-?)')
+_RE_MINI_SERIES_TAIL = re.compile(r'\bMINI-SERIES\b.*', re.IGNORECASE)
+_RE_EMPTY_PARENS = re.compile(r'\(\s*\)')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_SEASON_TAIL = re.compile(r'\bSeason \d+\b.*|\bS\d{1,2}EP?\d+\b.*', re.IGNORECASE)
+_RE_BRACKETED = re.compile(r'\[.*?\]')
+_RE_VIDEO_EXTENSION = re.compile(r'\.(mkv|mp4|avi)$', re.IGNORECASE)
+_RE_CODEC_RESOLUTION = re.compile(r'\b(x264|x265|h264|h265|720p|1080p|4K|2160p)\b', re.IGNORECASE)
+_RE_SIZE_MB = re.compile(r'\b\d+MB\b')
+_RE_SUBTITLE_TAGS = re.compile(r'\b(ESub|Eng Sub)\b', re.IGNORECASE)
+_RE_SEPARATORS = re.compile(r'[._-]')
+_RE_NON_WORD = re.compile(r'[^\w\s\(\)-]')
+# Whole words containing a digit standardize_title would rewrite; the symbols never occur inside \w words
+_RE_LEET_WORD = re.compile(r'\b\w*[0134579]\w*\b')
+_STANDARDIZE_TABLE = str.maketrans({
+    '0': 'o', '1': 'i', '4': 'a', '5': 's', '7': 't', '9': 'g',
+    '@': 'a', '#': 'h', '$': 's', '%': 'p', '&': 'and', '*': 'x',
+    '3': 'e', '8': 'b', '6': 'u'
+})
+_RE_TITLE = re.compile(r'^([^.]*?)\s*(?:[Ss]\d{2}[Ee]\d{2}|S\d{2}|E\d{2}|-\d{2,4}p|\.mkv|\.mp4|\.avi|$)')
+_RE_TITLE_TAIL = re.compile(r'\s*\d{2,4}p|\s*[Ss]\d{2}[Ee]\d{2}.*$')
+_RE_WEBSITE_DASH_PREFIX = re.compile(r'www\.[^\s]+\s+-\s+')
+_RE_MOVIE_RELEASE_TAGS = re.compile(r'\b(?:\d{3,4}p|WEB-DL|HDRIP|BLURAY|DVDRIP|UNTOUCHED|AVC|AAC|ESub)\b', re.IGNORECASE)
+_RE_FILE_SIZE = re.compile(r'\b\d+(?:\.\d+)?\s*(?:GB|MB)\b', re.IGNORECASE)
+_RE_DASHES = re.compile(r'-+')
+_RE_NUMBER = re.compile(r'\b\d+\b')
+_RE_LANGUAGES = re.compile(r'\b(?:Telugu|Hindi|Tamil|Malayalam|Kannada|Bengali|Punjabi|Marathi|Gujarati|English)\b', re.IGNORECASE)
+_RE_CONTAINER_WORDS = re.compile(r'\b(?:mkv|mp4|avi)\b', re.IGNORECASE)
+
+GENRE_NAMES = [
+    'Action', 'Comedy', 'Drama', 'Thriller', 'Horror', 'Romance', 'Adventure', 'Sci-Fi',
+    'Fantasy', 'Mystery', 'Crime', 'Documentary', 'Animation', 'Family', 'Music', 'War',
+    'Western', 'History', 'Biography'
+]
+_RE_GENRES = re.compile(r'\b(?:' + '|'.join(map(re.escape, GENRE_NAMES)) + r')\b', re.IGNORECASE)
+
+# Keyword alternations, built once per keywords file
+_keyword_patterns = {}
+_anime_patterns = {}
+
+# Per destination: (normalized name -> [(folder, year)], trigram -> normalized names,
+# names too short to have a trigram), refreshed by build_dest_index
+_variation_indexes = {}
+_variation_index_lock = threading.Lock()
+
 def fetch_json(url):
     """Fetch JSON data from the provided URL."""
     try:
-        response = requests.get(url)
+        response = http_session.get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         log_message(f"HTTP request failed: {e}", level="ERROR")
         return {}
 
+def year_of(date, default="Unknown Year"):
+    """Return the year of a TMDb 'YYYY-MM-DD' date, or default when it is missing."""
+    return date[:4] if date and len(date) >= 4 else default
+
 def extract_year(query):
-    match = re.search(r'\((\d{4})\)$', query.strip())
+    match = _RE_YEAR_PAREN_END.search(query.strip())
     if match:
         return int(match.group(1))
-    match = re.search(r'(\d{4})$', query.strip())
+    match = _RE_YEAR_END.search(query.strip())
     if match:
         return int(match.group(1))
     return None
 
 def extract_resolution(filename):
-    patterns = [
-        r'(\d{3,4}p)',
-        r'(\d{3,4}x\d{3,4})'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, filename, re.IGNORECASE)
+    for pattern in _RE_RESOLUTION_PATTERNS:
+        match = pattern.search(filename)
         if match:
             return match.group(1)
     return None
 
 def extract_resolution_from_folder(folder_name):
-    patterns = [
-        r'(\d{3,4}p)',
-        r'(\d{3,4}x\d{3,4})'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, folder_name, re.IGNORECASE)
+    for pattern in _RE_RESOLUTION_PATTERNS:
+        match = pattern.search(folder_name)
         if match:
             return match.group(1)
     return None
 
 def extract_folder_year(folder_name):
-    resolutions = {'1080', '480', '720', '2160'}
-
-    match = re.search(r'\((\d{4})\)', folder_name)
+    # A plausible year, which also rules out 1080/2160 resolution tags
+    match = _RE_YEAR_PAREN.search(folder_name)
     if match:
-        year = match.group(1)
-        if year not in resolutions:
-            return int(year)
+        year = int(match.group(1))
+        if 1900 <= year <= 2100:
+            return year
 
-    match = re.search(r'\.(\d{4})\.', folder_name)
+    match = _RE_YEAR_DOTTED.search(folder_name)
     if match:
-        year = match.group(1)
-        if year not in resolutions:
-            return int(year)
+        year = int(match.group(1))
+        if 1900 <= year <= 2100:
+            return year
 
     return None
 
+@lru_cache(maxsize=8192)
 def extract_movie_name_and_year(filename):
-    if re.match(r'^\d{1,2}\.\s+', filename):
-        filename = re.sub(r'^\d{1,2}\.\s*', '', filename)
-
-    patterns = [
-        r'(.+?)\s*\[(\d{4})\]',
-        r'(.+?)\s*\((\d{4})\)',
-        r'(.+?)\s*(\d{4})'
-    ]
-
-    # Attempt to match each pattern
-    for pattern in patterns:
-        match = re.search(pattern, filename)
-        if match:
-            name = match.group(1).replace('.', ' ').replace('-', ' ').strip()
-            name = re.sub(r'[\[\]]', '', name).strip()
-            year = match.group(2)
-            return name, year
-    return None, None
+    filename = _RE_LIST_NUMBER_PREFIX.sub('', filename)
+
+    # Scan all year tokens once and keep the first of the most preferred kind.
+    # The name needs at least one character, so tokens at position 0 are skipped.
+    best = None
+    for match in _RE_YEAR_TOKEN.finditer(filename, 1):
+        if best is None or match.lastindex < best.lastindex:
+            best = match
+            if match.lastindex == 1:
+                break
+
+    if best is None:
+        return None, None
+    name = filename[:best.start()].translate(_MOVIE_NAME_TABLE).strip()
+    return name, best.group(best.lastindex)
 
 def extract_resolution_from_filename(filename):
-    resolution_match = re.search(r'(2160p|1080p|720p|480p|2160|1080|720|480)', filename, re.IGNORECASE)
-    remux_match = re.search(r'(Remux)', filename, re.IGNORECASE)
+    resolution_match = _RE_RESOLUTION_TAG.search(filename)
+    remux_match = _RE_REMUX.search(filename)
 
     if resolution_match:
         resolution = resolution_match.group(1).lower()
@@ -95,139 +153,220 @@ def extract_resolution_from_filename(filename):
         return resolution
     return None
 
+def extract_resolution_tags(filename):
+    """
+    Scan a filename once for the tags that pick a resolution folder.
+    Returns (resolution, is_remux, is_4k, is_1080): resolution is the first tag as
+    extract_resolution_from_filename finds it, without the Remux suffix; is_4k and
+    is_1080 report any 2160/4k or 1080 occurrence.
+    """
+    resolution = None
+    is_remux = is_4k = is_1080 = False
+    for token in _RE_RESOLUTION_TOKENS.findall(filename):
+        token = token.lower()
+        if token == 'remux':
+            is_remux = True
+        elif token == '4k':
+            is_4k = True
+        else:
+            if resolution is None:
+                resolution = token
+            if token.startswith('2160'):
+                is_4k = True
+            elif token.startswith('1080'):
+                is_1080 = True
+    return resolution, is_remux, is_4k, is_1080
+
 def load_keywords(file_name, key="keywords"):
     file_path = os.path.join(os.path.dirname(__file__), file_name)
     with open(file_path, 'r') as file:
         data = json.load(file)
     return data.get(key, [])
 
+def get_keywords_pattern(keywords_file='keywords.json'):
+    """Return the compiled keyword alternation for a keywords file, loading it only once."""
+    pattern = _keyword_patterns.get(keywords_file)
+    if pattern is None:
+        remove_keywords = load_keywords(keywords_file)
+        pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, remove_keywords)) + r')\b', re.IGNORECASE)
+        _keyword_patterns[keywords_file] = pattern
+    return pattern
+
+# Memoized like the other pure string helpers: every file of a season re-cleans the same folder name
+@lru_cache(maxsize=8192)
 def clean_query(query, keywords_file='keywords.json'):
     if not isinstance(query, str):
         log_message(f"Invalid query type: {type(query)}. Expected string.", "ERROR", "stderr")
         return "", None
 
-    log_message(f"Original query: '{query}'", "DEBUG", "stdout")
-
-    query = re.sub(r'(?:www\.\S+\.\S+\s*-?)', '', query)
-
-    remove_keywords = load_keywords(keywords_file)
+    if log_enabled("DEBUG"):
+        log_message(f"Original query: '{query}'", "DEBUG", "stdout")
 
+    query = _RE_WEBSITE_PREFIX.sub('', query)
     query = query.replace('.', ' ')
-
-    keywords_pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, remove_keywords)) + r')\b', re.IGNORECASE)
-    query = keywords_pattern.sub('', query)
-
-    query = re.sub(r'\bMINI-SERIES\b.*', '', query, flags=re.IGNORECASE)
-    query = re.sub(r'\(\s*\)', '', query)
-    query = re.sub(r'\s+', ' ', query).strip()
-    query = re.sub(r'\bSeason \d+\b.*|\bS\d{1,2}EP?\d+\b.*', '', query, flags=re.IGNORECASE)
-    query = re.sub(r'\[.*?\]', '', query)
-    query = re.sub(r'\(\d{4}\)', '', query)
-    query = re.sub(r'\.(mkv|mp4|avi)$', '', query, flags=re.IGNORECASE)
-    query = re.sub(r'\b(x264|x265|h264|h265|720p|1080p|4K|2160p)\b', '', query, flags=re.IGNORECASE)
-    query = re.sub(r'\b\d+MB\b', '', query)
-    query = re.sub(r'\b(ESub|Eng Sub)\b', '', query, flags=re.IGNORECASE)
-
+    query = get_keywords_pattern(keywords_file).sub('', query)
+
+    query = _RE_MINI_SERIES_TAIL.sub('', query)
+    query = _RE_EMPTY_PARENS.sub('', query)
+    query = _RE_WHITESPACE.sub(' ', query).strip()
+    query = _RE_SEASON_TAIL.sub('', query)
+    query = _RE_BRACKETED.sub('', query)
+    query = _RE_YEAR_PAREN.sub('', query)
+    query = _RE_VIDEO_EXTENSION.sub('', query)
+    query = _RE_CODEC_RESOLUTION.sub('', query)
+    query = _RE_SIZE_MB.sub('', query)
+    query = _RE_SUBTITLE_TAGS.sub('', query)
+
+    flush_logs()
     print(f"Final cleaned query: '{query}'")
     return query, None
 
+@lru_cache(maxsize=8192)
 def normalize_query(query):
     if not isinstance(query, str):
         log_message(f"Invalid query type: {type(query)}. Expected string.", "ERROR", "stderr")
         return ""
 
-    normalized_query = re.sub(r'[._-]', ' ', query)
-    normalized_query = re.sub(r'[^\w\s\(\)-]', '', normalized_query)
-    normalized_query = re.sub(r'\s+', ' ', normalized_query).strip()
+    normalized_query = _RE_SEPARATORS.sub(' ', query)
+    normalized_query = _RE_NON_WORD.sub('', normalized_query)
+    normalized_query = _RE_WHITESPACE.sub(' ', normalized_query).strip()
 
     return normalized_query
 
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _add_variation(variation_index, normalized, name, year):
+    names, trigrams, short_names = variation_index
+    if normalized not in names:
+        grams = _trigrams(normalized)
+        for gram in grams:
+            trigrams.setdefault(gram, set()).add(normalized)
+        if not grams:
+            short_names.add(normalized)
+    names.setdefault(normalized, []).append((name, year))
+
+def _partial_candidates(variation_index, normalized_query):
+    """
+    Names that can contain, or be contained in, the query. Either way the two
+    share a trigram unless one is shorter than three characters.
+    """
+    names, trigrams, short_names = variation_index
+    grams = _trigrams(normalized_query)
+    if not grams:
+        return list(names)
+    candidates = set(short_names)
+    for gram in grams:
+        candidates.update(trigrams.get(gram, ()))
+    return candidates
+
 def check_existing_variations(name, year, dest_dir):
     normalized_query = normalize_query(name)
-    log_message(f"Checking existing variations for: {name} ({year})", level="DEBUG")
-    exact_match = None
+    debug = log_enabled("DEBUG")
+    if debug:
+        log_message(f"Checking existing variations for: {name} ({year})", level="DEBUG")
     partial_matches = []
 
-    for root, dirs, _ in os.walk(dest_dir):
-        for d in dirs:
-            normalized_d = normalize_query(d)
-            d_year = extract_year(d)
-
-            # Prioritize exact matches
-            if normalized_query == normalized_d and (d_year == year or not year or not d_year):
-                log_message(f"Found exact matching variation: {d}", level="DEBUG")
+    with _variation_index_lock:
+        variation_index = _variation_indexes.get(dest_dir)
+    if variation_index is None:
+        build_dest_index(dest_dir)
+        variation_index = _variation_indexes[dest_dir]
+
+    names = variation_index[0]
+    with _variation_index_lock:
+        # Prioritize exact matches
+        for d, d_year in names.get(normalized_query, ()):
+            if d_year == year or not year or not d_year:
+                if debug:
+                    log_message(f"Found exact matching variation: {d}", level="DEBUG")
                 return d
 
-            # Collect partial matches with stricter criteria
+        # Collect partial matches with stricter criteria
+        for normalized_d in _partial_candidates(variation_index, normalized_query):
             if (normalized_query in normalized_d or normalized_d in normalized_query) and abs(len(normalized_query) - len(normalized_d)) < 5:
-                partial_matches.append((d, d_year))
+                partial_matches.extend(names[normalized_d])
+
+        if not partial_matches:
+            # The caller creates this folder next, so later files of the same run can match it
+            _add_variation(variation_index, normalized_query, name, extract_year(name))
 
     if partial_matches:
         # Select the best partial match based on length and year
-        closest_match = min(partial_matches, key=lambda x: (len(x[0]), x[1] != year))
-        log_message(f"Found closest matching variation: {closest_match[0]}", level="DEBUG")
+        closest_match = min(partial_matches, key=lambda x: (len(x[0]), x[1] != year, x[0]))
+        if debug:
+            log_message(f"Found closest matching variation: {closest_match[0]}", level="DEBUG")
         return closest_match[0]
 
-    log_message(f"No matching variations found for: {name} ({year})", level="DEBUG")
+    if debug:
+        log_message(f"No matching variations found for: {name} ({year})", level="DEBUG")
     return None
 
 def build_dest_index(dest_dir):
-    dest_index = set()
-    for root, dirs, files in os.walk(dest_dir):
-        for name in dirs + files:
-            dest_index.add(os.path.join(root, name))
+    """
+    Scan dest_dir once with os.scandir and return a dict mapping each symlink's target
+    to the symlink path, so existing links are found with one lookup per source file.
+    Directory names are also indexed by normalized name for check_existing_variations,
+    so movie lookups reuse this scan instead of walking the tree per file.
+    """
+    dest_index = {}
+    variation_index = ({}, {}, set())
+    pending = [dest_dir]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        try:
+                            dest_index.setdefault(os.readlink(entry.path), entry.path)
+                        except OSError:
+                            pass
+                    # Like os.walk, list symlinked directories but do not descend into them
+                    if entry.is_dir():
+                        # Season and Extras folders sit inside titles and are never variations of one
+                        if entry.name != 'Extras' and not entry.name.startswith('Season '):
+                            _add_variation(variation_index, normalize_query(entry.name), entry.name, extract_year(entry.name))
+                        if not entry.is_symlink():
+                            pending.append(entry.path)
+        except OSError:
+            # Unreadable or missing directories are skipped, as os.walk does
+            continue
+
+    with _variation_index_lock:
+        _variation_indexes[dest_dir] = variation_index
     return dest_index
 
+@lru_cache(maxsize=8192)
 def standardize_title(title, check_word_count=True):
-    replacements = {
-        '0': 'o', '1': 'i', '4': 'a', '5': 's', '7': 't', '9': 'g',
-        '@': 'a', '#': 'h', '$': 's', '%': 'p', '&': 'and', '*': 'x',
-        '3': 'e', '8': 'b', '6': 'u'
-    }
-
-    def replacement_func(match):
-        char = match.group(0)
-        standardized_char = replacements.get(char, char)
-        return standardized_char
-
     if check_word_count:
         # Count words with non-standard characters
-        words = re.findall(r'\b\w+\b', title)
-        affected_count = sum(
-            1 for word in words if re.search(r'[014579@#$%&*3]', word)
-        )
+        affected_count = len(_RE_LEET_WORD.findall(title))
 
         # Standardize title if more than 4 words are affected
         if affected_count > 4:
-            standardized_title = re.sub(r'[0-9@#$%&*3]', replacement_func, title)
+            standardized_title = title.translate(_STANDARDIZE_TABLE)
         else:
             standardized_title = title
     else:
         # Always standardize title
-        standardized_title = re.sub(r'[0-9@#$%&*3]', replacement_func, title)
+        standardized_title = title.translate(_STANDARDIZE_TABLE)
 
     # Clean up extra spaces
-    standardized_title = re.sub(r'\s+', ' ', standardized_title).strip()
+    standardized_title = _RE_WHITESPACE.sub(' ', standardized_title).strip()
     return standardized_title
 
 def remove_genre_names(query):
-    genre_names = [
-        'Action', 'Comedy', 'Drama', 'Thriller', 'Horror', 'Romance', 'Adventure', 'Sci-Fi',
-        'Fantasy', 'Mystery', 'Crime', 'Documentary', 'Animation', 'Family', 'Music', 'War',
-        'Western', 'History', 'Biography'
-    ]
-    for genre in genre_names:
-        query = re.sub(r'\b' + re.escape(genre) + r'\b', '', query, flags=re.IGNORECASE)
-    query = re.sub(r'\s+', ' ', query).strip()
+    query = _RE_GENRES.sub('', query)
+    query = _RE_WHITESPACE.sub(' ', query).strip()
     return query
 
 
 def extract_title(filename):
-    pattern = r'^([^.]*?)\s*(?:[Ss]\d{2}[Ee]\d{2}|S\d{2}|E\d{2}|-\d{2,4}p|\.mkv|\.mp4|\.avi|$)'
-    match = re.match(pattern, filename)
+    match = _RE_TITLE.match(filename)
     if match:
         title = match.group(1).replace('.', ' ').replace('-', ' ').strip()
-        title = re.sub(r'\s*\d{2,4}p|\s*[Ss]\d{2}[Ee]\d{2}.*$', '', title).strip()
+        title = _RE_TITLE_TAIL.sub('', title).strip()
         return title
     else:
         return "", None
@@ -236,7 +375,11 @@ def get_anime_patterns(keywords_file='keywords.json'):
     """
     Returns a compiled regex pattern for detecting anime files.
     Includes patterns for common anime release groups, formats, and naming conventions.
+    The pattern is built once per keywords file.
     """
+    pattern = _anime_patterns.get(keywords_file)
+    if pattern is not None:
+        return pattern
 
     release_groups = load_keywords(keywords_file, key="release_groups")
 
@@ -258,27 +401,32 @@ def get_anime_patterns(keywords_file='keywords.json'):
     ]
 
     combined_pattern = '|'.join(f'(?:{pattern})' for pattern in anime_patterns)
-    return re.compile(combined_pattern, re.IGNORECASE)
+    pattern = re.compile(combined_pattern, re.IGNORECASE)
+    _anime_patterns[keywords_file] = pattern
+    return pattern
+
+# Image and text files that never count as media
+_SKIP_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.ping', '.txt'})
 
 def skip_files(file):
     """Determine if the file should be skipped based on its extension."""
-    extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.ping', '.txt'}
-    _, ext = os.path.splitext(file.lower())
-    return ext in extensions
+    return os.path.splitext(file)[1].lower() in _SKIP_EXTENSIONS
 
-def is_file_extra(file, file_path):
+def is_file_extra(file, file_path, entry=None):
     """
     Determine if the file is an extra based on size.
     Skip .srt files regardless of size.
+    A DirEntry from os.scandir, if given, answers the symlink and size checks from its cache.
     """
 
-    if os.path.islink(file_path):
+    if entry.is_symlink() if entry is not None else os.path.islink(file_path):
         return False
 
     if file.lower().endswith('.srt'):
         return False
 
-    file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    file_size = entry.stat().st_size if entry is not None else os.path.getsize(file_path)
+    file_size_mb = file_size / (1024 * 1024)
 
     extras_max_size_mb = get_extras_max_size_mb()
 
@@ -292,24 +440,22 @@ def clean_query_movie(query, keywords_file='keywords.json'):
         log_message(f"Invalid query type: {type(query)}. Expected string.", "ERROR", "stderr")
         return ""
 
-    log_message(f"Original query: '{query}'", "DEBUG", "stdout")
-
-    # Load keywords to remove
-    remove_keywords = load_keywords(keywords_file)
+    if log_enabled("DEBUG"):
+        log_message(f"Original query: '{query}'", "DEBUG", "stdout")
 
-    query = re.sub(r'www\.[^\s]+\s+-\s+', '', query)
+    query = _RE_WEBSITE_DASH_PREFIX.sub('', query)
     query = query.replace('.', ' ')
-    keywords_pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, remove_keywords)) + r')\b', re.IGNORECASE)
-    query = keywords_pattern.sub('', query)
-    query = re.sub(r'\b(?:\d{3,4}p|WEB-DL|HDRIP|BLURAY|DVDRIP|UNTOUCHED|AVC|AAC|ESub)\b', '', query, flags=re.IGNORECASE)
-    query = re.sub(r'\b\d+(?:\.\d+)?\s*(?:GB|MB)\b', '', query, flags=re.IGNORECASE)
-    query = re.sub(r'\(\d{4}\)', '', query)
-    query = re.sub(r'\[.*?\]', '', query)
-    query = re.sub(r'-+', ' ', query)
-    query = re.sub(r'\s+', ' ', query).strip()
-    query = re.sub(r'\b\d+\b', '', query).strip()
-    query = re.sub(r'\b(?:Telugu|Hindi|Tamil|Malayalam|Kannada|Bengali|Punjabi|Marathi|Gujarati|English)\b', '', query, flags=re.IGNORECASE).strip()
-    query = re.sub(r'\b(?:mkv|mp4|avi)\b', '', query, flags=re.IGNORECASE).strip()
-
-    log_message(f"Cleaned movie query: '{query}'", "DEBUG", "stdout")
+    query = get_keywords_pattern(keywords_file).sub('', query)
+    query = _RE_MOVIE_RELEASE_TAGS.sub('', query)
+    query = _RE_FILE_SIZE.sub('', query)
+    query = _RE_YEAR_PAREN.sub('', query)
+    query = _RE_BRACKETED.sub('', query)
+    query = _RE_DASHES.sub(' ', query)
+    query = _RE_WHITESPACE.sub(' ', query).strip()
+    query = _RE_NUMBER.sub('', query).strip()
+    query = _RE_LANGUAGES.sub('', query).strip()
+    query = _RE_CONTAINER_WORDS.sub('', query).strip()
+
+    if log_enabled("DEBUG"):
+        log_message(f"Cleaned movie query: '{query}'", "DEBUG", "stdout")
     return query
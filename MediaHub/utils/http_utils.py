@@ -0,0 +1,20 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One HTTP session for the whole process, so every TMDb and metadata call
+# shares a single keep-alive connection pool
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods={'GET'}
+    )
+))
+
+# (connect, read) timeout passed to every request
+REQUEST_TIMEOUT = (3.05, 10)
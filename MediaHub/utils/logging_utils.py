@@ -1,6 +1,9 @@
 from datetime import datetime
 import sys
 import os
+import threading
+import queue
+import atexit
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -22,14 +25,91 @@ api_warning_logged = False
 
 #LOG_LEVEL = 20  # Default to INFO
 
+# Log files are opened once and kept open, line buffered, instead of per message
+_log_files = {}
+_log_files_lock = threading.Lock()
+
+def _log_file(path):
+    with _log_files_lock:
+        log_file = _log_files.get(path)
+        if log_file is None:
+            log_file = open(path, 'a', buffering=1)
+            _log_files[path] = log_file
+        return log_file
+
+# Worker threads only enqueue finished lines; one writer thread does the actual I/O,
+# writing everything queued for a stream in a single call. An Event in the queue is a
+# flush request, set once everything queued before it has been written.
+_log_queue = queue.SimpleQueue()
+
+def _write_logs():
+    while True:
+        batch = [_log_queue.get()]
+        try:
+            while True:
+                batch.append(_log_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        pending = {}
+        flushes = []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                flushes.append(item)
+            elif item is not None:
+                output, log_entry = item
+                pending.setdefault(output, []).append(log_entry)
+
+        for output, entries in pending.items():
+            text = ''.join(entries)
+            try:
+                if output == "stdout":
+                    sys.stdout.write(text)
+                elif output == "stderr":
+                    sys.stderr.write(text)
+                else:
+                    _log_file(output).write(text)
+            except (OSError, ValueError):
+                # A closed stream or unwritable log file must not stop the writer
+                pass
+
+        if flushes:
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except (OSError, ValueError):
+                    pass
+            for done in flushes:
+                done.set()
+
+        if None in batch:
+            return
+
+_log_writer = threading.Thread(target=_write_logs, name="log-writer", daemon=True)
+_log_writer.start()
+
+@atexit.register
+def _stop_log_writer():
+    """Drain queued messages before the interpreter exits."""
+    _log_queue.put(None)
+    _log_writer.join(timeout=5)
+
+def flush_logs():
+    """
+    Block until every message logged so far has been written. Call before reading
+    from stdin or printing directly, so queued lines are not reordered against them.
+    """
+    if not _log_writer.is_alive():
+        return
+    done = threading.Event()
+    _log_queue.put(done)
+    done.wait()
+
+def log_enabled(level):
+    """Check whether messages of this level would be logged, so callers can skip building them."""
+    return LOG_LEVELS.get(level, 20) >= LOG_LEVEL
+
 def log_message(message, level="INFO", output="stdout"):
     if LOG_LEVELS.get(level, 20) >= LOG_LEVEL:
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_entry = f"{timestamp} [{level}] {message}\n"
-        if output == "stdout":
-            sys.stdout.write(log_entry)
-        elif output == "stderr":
-            sys.stderr.write(log_entry)
-        else:
-            with open(output, 'a') as log_file:
-                log_file.write(log_entry)
+        _log_queue.put((output, f"{timestamp} [{level}] {message}\n"))